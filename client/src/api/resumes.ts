@@ -0,0 +1,26 @@
+import api from './axios';
+
+interface ResumeLink {
+  url: string;
+  expires_in: number;
+}
+
+// Opens a resume in a new tab through a short-lived link that only grants access
+// to that file, so the session token never ends up in a URL. The tab is opened
+// before the request so popup blockers still treat it as a user action.
+export async function openResume(hash: string) {
+  const tab = window.open('', '_blank');
+  try {
+    const { data } = await api.post<ResumeLink>(`/resumes/${hash}/link`);
+    const url = `${(api.defaults.baseURL ?? '').replace(/\/$/, '')}${data.url}`;
+    if (tab) {
+      tab.opener = null;
+      tab.location.href = url;
+    } else {
+      window.location.href = url;
+    }
+  } catch (error) {
+    tab?.close();
+    throw error;
+  }
+}
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { format } from 'date-fns';
 import api from '../api/axios';
@@ -15,7 +15,7 @@ import {
 } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
 import { Textarea } from '@/components/ui/textarea';
-import { cn } from '@/lib/utils';
+import { cn, randomUUID } from '@/lib/utils';
 
 interface Job {
   id: string;
@@ -56,6 +56,9 @@ const ActiveJobs = () => {
   const [submitting, setSubmitting] = useState(false);
   const [feedback, setFeedback] = useState<{ type: 'success' | 'error'; message: string } | null>(null);
   const [expandedJobId, setExpandedJobId] = useState<string | null>(null);
+  // One Idempotency-Key per application attempt: retries of the same form reuse it,
+  // so the server replays the original application instead of answering 409.
+  const idempotencyKey = useRef(randomUUID());
 
   useEffect(() => {
     const fetchJobs = async () => {
@@ -112,6 +115,11 @@ const ActiveJobs = () => {
       });
   }, [jobs, search, focusFilter, workFilter]);
 
+  // A different job or different answers make a new attempt.
+  useEffect(() => {
+    idempotencyKey.current = randomUUID();
+  }, [applyJob, coverLetter, skillsInput, certInput, resumeFile]);
+
   const resetForm = () => {
     setCoverLetter('');
     setSkillsInput('');
@@ -153,12 +161,20 @@ const ActiveJobs = () => {
 
     try {
       await api.post(`/applications/apply/${applyJob.id}`, formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
+        headers: {
+          'Content-Type': 'multipart/form-data',
+          // Lets the server replay (not duplicate) this submission if it is retried.
+          'Idempotency-Key': idempotencyKey.current,
+        },
       });
       setFeedback({ type: 'success', message: 'Application submitted successfully.' });
       setApplyJob(null);
       resetForm();
     } catch (error: any) {
+      if (error?.response) {
+        // The server answered, so this attempt is settled; a retry is a new one.
+        idempotencyKey.current = randomUUID();
+      }
       const message =
         error?.response?.data?.detail || error?.message || 'Failed to submit application';
       setFeedback({ type: 'error', message });
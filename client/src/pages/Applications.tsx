@@ -1,5 +1,6 @@
 import { useEffect, useMemo, useState } from 'react';
 import api from '../api/axios';
+import { openResume } from '../api/resumes';
 import { useAuthStore } from '../store/authStore';
 import { Badge } from '@/components/ui/badge';
 import {
@@ -18,6 +19,7 @@ interface Application {
   status: string;
   submitted_at: string;
   resume_path: string;
+  resume_hash?: string | null;
   resume_text: string;
   ai_reasoning?: string;
   job: {
@@ -65,6 +67,7 @@ const Applications = () => {
     fetchApplications();
   }, [isAdmin]);
 
+  // Uploads made before content addressing have no hash and keep their static path.
   const getResumeUrl = (path: string) => {
     if (!path) return null;
     if (path.startsWith('http')) return path;
@@ -72,6 +75,12 @@ const Applications = () => {
     return `${API_BASE_URL.replace(/\/$/, '')}/${normalized}`;
   };
 
+  const downloadResume = (hash: string) => {
+    openResume(hash).catch((err: any) => {
+      setError(err?.response?.data?.detail || err?.message || 'Failed to open resume');
+    });
+  };
+
   const stats = useMemo(() => {
     const total = applications.length;
     const interviewing = applications.filter((app) => app.status === 'SHORTLISTED').length;
@@ -315,15 +324,25 @@ const Applications = () => {
                     Chat with your talent partner
                   </a>
                 </div>
-                {getResumeUrl(selected.resume_path) && (
-                  <a
+                {selected.resume_hash ? (
+                  <button
+                    type="button"
                     className="btn-secondary rounded-full px-6 py-3"
-                    href={getResumeUrl(selected.resume_path) ?? '#'}
-                    target="_blank"
-                    rel="noreferrer"
+                    onClick={() => downloadResume(selected.resume_hash!)}
                   >
                     Download resume
-                  </a>
+                  </button>
+                ) : (
+                  getResumeUrl(selected.resume_path) && (
+                    <a
+                      className="btn-secondary rounded-full px-6 py-3"
+                      href={getResumeUrl(selected.resume_path) ?? '#'}
+                      target="_blank"
+                      rel="noreferrer"
+                    >
+                      Download resume
+                    </a>
+                  )
                 )}
               </CardFooter>
             </>
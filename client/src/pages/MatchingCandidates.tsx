@@ -2,6 +2,7 @@ import { useEffect, useMemo, useState } from 'react';
 import { Navigate, useParams } from 'react-router-dom';
 import { format } from 'date-fns';
 import api from '../api/axios';
+import { openResume } from '../api/resumes';
 import { useAuthStore } from '../store/authStore';
 import './Candidates.css';
 
@@ -10,6 +11,7 @@ interface Application {
   status: string;
   submitted_at: string;
   resume_path: string;
+  resume_hash?: string | null;
   resume_text: string;
   ai_reasoning?: string;
   job: {
@@ -71,6 +73,7 @@ const MatchingCandidates = () => {
     return <div className="loading">Loading...</div>;
   }
 
+  // Uploads made before content addressing have no hash and keep their static path.
   const getResumeUrl = (path: string) => {
     if (!path) return null;
     if (path.startsWith('http')) return path;
@@ -139,7 +142,19 @@ const MatchingCandidates = () => {
                   </div>
                 )}
                 <div className="detail-actions">
-                  {getResumeUrl(selected.resume_path) ? (
+                  {selected.resume_hash ? (
+                    <button
+                      type="button"
+                      className="btn-action"
+                      onClick={() =>
+                        openResume(selected.resume_hash!).catch((error) =>
+                          console.error('Failed to open resume', error)
+                        )
+                      }
+                    >
+                      Download resume
+                    </button>
+                  ) : getResumeUrl(selected.resume_path) ? (
                     <a
                       href={getResumeUrl(selected.resume_path) ?? '#'}
                       target="_blank"
@@ -1,94 +1,137 @@
 import os
 import json
-import google.generativeai as genai
-import PyPDF2
-import docx
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import update
 from sqlmodel import Session
 from dotenv import load_dotenv
 
 # Import DB engine and models
 from db import engine
-from models import Application, Job
+from models import Application, CandidateProfile, DecisionHistory, Job
+from prompt_builder import build_screening_prompt, estimate_tokens
+from quotas import QuotaExceeded, reserve_screening
+from resume_parser import parse_resume
+from resume_profile import create_profile, find_profile, hash_file
+from storage import get_storage
 
-# --- Load API Key ---
 load_dotenv()
-API_KEY = os.environ.get("GOOGLE_API_KEY")
-if not API_KEY:
-    raise ValueError("GOOGLE_API_KEY not found in .env file")
-genai.configure(api_key=API_KEY)
 
+# API-only workers (AI_SCREENING_ENABLED=false) never schedule screenings, so
+# they never import the Gemini SDK.
+AI_SCREENING_ENABLED = os.getenv("AI_SCREENING_ENABLED", "true").lower() not in ("0", "false", "no")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 
-def parse_resume(file_path: str) -> str:
-    """Parses a resume file (PDF or DOCX) and returns the text."""
-    text = ""
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Imports and configures the Gemini SDK on first use. google.generativeai pulls
+    in gRPC and protobuf, which dominates worker boot time, so it is kept out of
+    import time. A missing GOOGLE_API_KEY surfaces here, on the first screening.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+
+                api_key = os.environ.get("GOOGLE_API_KEY")
+                if not api_key:
+                    raise ValueError("GOOGLE_API_KEY not found in .env file")
+                genai.configure(api_key=api_key)
+                _model = genai.GenerativeModel(GEMINI_MODEL)
+    return _model
+
+
+def warm_model():
+    """Loads the Gemini client at startup so the first screening does not pay for it."""
     try:
-        if file_path.endswith('.pdf'):
-            with open(file_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
-
-        elif file_path.endswith('.docx'):
-            doc = docx.Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-
-        elif file_path.endswith('.txt'):
-            with open(file_path, 'r') as f:
-                text = f.read()
-
-        print(f"[Parser]: Successfully parsed {file_path}")
-        return text
+        get_model()
     except Exception as e:
-        print(f"[Parser Error]: Could not parse {file_path}. Error: {e}")
-        return f"Error: Could not parse resume file. {e}"
+        print(f"[Gemini Error]: Could not initialise the client: {e}")
 
 
-def call_gemini_api(job: Job, app: Application, resume_text: str) -> (str, str):
-    """Calls the Gemini API to get a JSON decision."""
-    prompt_template = f"""
-    You are an expert AI recruiter. Analyze the candidate's application against the job description.
-
-    **Job Description:**
-    - Title: {job.title}
-    - Required Skills: {', '.join(job.required_skills)}
-    - Required Certifications: {', '.join(job.required_certifications)}
-
-    **Candidate's Application:**
-    - Cover Letter: {app.cover_letter}
-    - Claimed Skills: {', '.join(app.skills)}
-    - Claimed Certifications: {', '.join(app.certifications)}
-    - Parsed Resume Text: {resume_text}
-
-    **Your Task:**
-    Return your decision *only* in the following JSON format:
-    {{
-      "decision": "ACCEPTED" | "REJECTED" | "PENDING",
-      "reasoning": "A brief, one-sentence explanation for your decision."
-    }}
-    """
+def request_decision(
+        job: Job,
+        app: Application,
+        resume_text: str,
+        profile: Optional[CandidateProfile] = None,
+        prompt: Optional[str] = None,
+) -> Tuple[str, str]:
+    """Asks Gemini for a JSON decision. Raises if the call or the response fails."""
+    prompt_template = prompt or build_screening_prompt(job, app, resume_text, profile=profile)
 
-    try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt_template)
-        json_text = response.text.strip().lstrip("```json").rstrip("```")
-        data = json.loads(json_text)
+    response = get_model().generate_content(prompt_template)
+    json_text = response.text.strip().lstrip("```json").rstrip("```")
+    data = json.loads(json_text)
+
+    decision = data.get("decision", "PENDING").upper()
+    reasoning = data.get("reasoning", "No reasoning provided by AI.")
 
-        decision = data.get("decision", "PENDING").upper()
-        reasoning = data.get("reasoning", "No reasoning provided by AI.")
+    if decision not in ["ACCEPTED", "REJECTED", "PENDING"]:
+        decision = "PENDING"
 
-        if decision not in ["ACCEPTED", "REJECTED", "PENDING"]:
-            decision = "PENDING"
+    return decision, reasoning
 
-        return decision, reasoning
+
+def call_gemini_api(
+        job: Job,
+        app: Application,
+        resume_text: str,
+        profile: Optional[CandidateProfile] = None,
+        prompt: Optional[str] = None,
+) -> (str, str):
+    """Calls the Gemini API to get a JSON decision."""
+    try:
+        return request_decision(job, app, resume_text, profile, prompt)
     except Exception as e:
         print(f"[Gemini Error]: {e}")
         return "PENDING", f"AI analysis failed: {e}"
 
 
-def run_ai_screening(app_id: str, job_id: str):
-    """The complete background task."""
+def load_resume(session: Session, app: Application) -> Optional[CandidateProfile]:
+    """
+    Fills app.resume_text, parsing each distinct resume only once.
+    If the application already has a profile (e.g. on a re-screen), or one exists
+    for the resume hash, it is reused and the file is never fetched from storage.
+    """
+    profile = session.get(CandidateProfile, app.profile_id) if app.profile_id else None
+    if not profile and app.resume_hash:
+        profile = find_profile(session, app.candidate_id, app.resume_hash)
+    if not profile:
+        with get_storage().local_path(app.resume_path) as resume_file:
+            # Older uploads were not hashed on submit.
+            app.resume_hash = app.resume_hash or hash_file(resume_file)
+            profile = find_profile(session, app.candidate_id, app.resume_hash)
+            if not profile:
+                app.resume_text = parse_resume(resume_file)
+                profile = create_profile(session, app.candidate_id, app.resume_hash, app.resume_text)
+    else:
+        print(f"[Background Task]: Reusing profile {profile.id}, skipping resume parse")
+
+    if profile:
+        app.profile_id = profile.id
+        app.resume_text = profile.resume_text
+    return profile
+
+
+def run_ai_screening(
+        app_id: str, job_id: str, run_id: Optional[str] = None, override_recruiter: bool = False
+) -> Optional[Tuple[str, str]]:
+    """
+    The complete background task. Returns (previous_status, new_status), or None
+    if the application could not be screened. Re-screens (run_id set) keep the
+    previous decision when Gemini fails instead of resetting it to PENDING.
+    A status set by a recruiter (Application.decided_by), even one set while
+    Gemini was answering, is kept unless override_recruiter is True.
+    Raises QuotaExceeded, before calling Gemini, when the job or its owner is
+    over quota; the caller defers the screening.
+    """
     print(f"[Background Task]: Starting for application {app_id}")
     with Session(engine) as session:
         try:
@@ -98,17 +141,75 @@ def run_ai_screening(app_id: str, job_id: str):
                 print(f"[Background Task Error]: Could not find app or job.")
                 return
 
-            app.resume_text = parse_resume(app.resume_path)
-            decision, reasoning = call_gemini_api(job, app, app.resume_text)
-
-            app.status = decision
-            app.ai_reasoning = reasoning
-            app.reviewed_at = datetime.utcnow()
-
+            profile = load_resume(session, app)
+            # Persist the parse before the slow Gemini call so no transaction is held open.
             session.add(app)
             session.commit()
+
+            prompt = build_screening_prompt(job, app, app.resume_text, profile=profile)
+            reserve_screening(job.owner_id, job.id, estimate_tokens(prompt))
+
+            if run_id:
+                decision, reasoning = request_decision(job, app, app.resume_text, profile, prompt)
+            else:
+                decision, reasoning = call_gemini_api(job, app, app.resume_text, profile, prompt)
+
+            previous_status = app.status
+            statement = update(Application).where(Application.id == app.id)
+            if not override_recruiter:
+                # Conditional UPDATE: a recruiter's decision made meanwhile wins.
+                statement = statement.where(Application.decided_by.is_(None))
+            result = session.execute(statement.values(
+                status=decision, ai_reasoning=reasoning, reviewed_at=datetime.utcnow(), decided_by=None,
+            ))
+            if not result.rowcount:
+                session.rollback()
+                print(f"[Background Task]: Kept recruiter decision for application {app_id}")
+                return previous_status, previous_status
+            session.add(DecisionHistory(
+                application_id=app.id,
+                run_id=run_id,
+                previous_status=previous_status,
+                status=decision,
+                reasoning=reasoning,
+            ))
+            session.commit()
             print(f"[Background Task]: Finished for application {app_id}. Decision: {decision}")
+            return previous_status, decision
 
+        except QuotaExceeded:
+            raise
         except Exception as e:
             print(f"[Background Task Error]: A critical error occurred: {e}")
-            session.rollback()
\ No newline at end of file
+            session.rollback()
+
+
+class ScreeningPool:
+    """
+    Runs screenings on a fixed number of threads. submit() blocks once
+    max_pending screenings are queued, so bulk producers cannot run ahead of
+    the Gemini calls and pile up work in memory.
+    """
+
+    def __init__(self, concurrency: int, max_pending: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="screening")
+        self._slots = threading.BoundedSemaphore(max_pending or concurrency * 2)
+
+    def submit(self, fn, *args) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,93 @@
+# bench_import.py
+"""
+Measures worker boot time: how long `import main` takes in a fresh interpreter,
+and which heavyweight modules (Gemini SDK, gRPC, PDF/DOCX parsers) it loads.
+
+Each sample runs in a new subprocess so nothing is cached in sys.modules. Run it
+before and after changing imports to catch boot-time regressions.
+
+    python bench_import.py
+    python bench_import.py --repeat 10 --api-only
+    python bench_import.py --top 15      # slowest imports made by main (python -X importtime)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["google.generativeai", "grpc", "google.protobuf", "PyPDF2", "docx", "pyarrow", "boto3"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def probe_env(api_only: bool) -> dict:
+    env = dict(os.environ)
+    # Placeholders so the probe runs without a .env file; the engine never connects.
+    env.setdefault("SECRET_KEY", "bench")
+    env.setdefault("DATABASE_URL", "sqlite://")
+    if api_only:
+        env["AI_SCREENING_ENABLED"] = "false"
+    return env
+
+
+def sample(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: dict, top: int):
+    """Cumulative time of each module main imports directly, from python -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    )
+    # Children are printed before their parent, indented two spaces per level.
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == "main":
+                return sorted(children, reverse=True)[:top]
+            children = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--api-only", action="store_true", help="Set AI_SCREENING_ENABLED=false")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports made by main")
+    args = parser.parse_args()
+
+    env = probe_env(args.api_only)
+    samples = [sample(env) for _ in range(args.repeat)]
+    times = [s["seconds"] * 1000 for s in samples]
+    print(f"import main ({'api-only' if args.api_only else 'default'}), {args.repeat} fresh interpreters")
+    print(f"  best {min(times):.0f} ms, median {statistics.median(times):.0f} ms, worst {max(times):.0f} ms")
+    loaded = samples[-1]["loaded"]
+    print(f"  heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+    if args.top:
+        print("\nSlowest imports made by main (cumulative ms):")
+        for micros, name in slowest_imports(env, args.top):
+            print(f"  {micros / 1000:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_parse.py
+"""
+Micro-benchmark for resume PDF parsing.
+
+Compares the old extractor (read every page, `text += ...`) with the bounded,
+memory-mapped extractor in resume_parser. Uses the PDFs in ./uploads/resumes;
+if there are none, a few synthetic resumes (1-100 pages) are generated first.
+
+    python bench_parse.py
+    python bench_parse.py --dir ./uploads/resumes --repeat 5
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import PyPDF2
+
+from resume_parser import RESUME_MAX_CHARS, RESUME_MAX_PAGES, extract_pdf_text
+
+LINE = "Senior engineer building Python and FastAPI services backed by PostgreSQL."
+
+
+def legacy_extract(file_path: str) -> str:
+    """The extractor as it was before: every page, quadratic string building."""
+    text = ""
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for page in reader.pages:
+            text += page.extract_text() or ""
+    return text
+
+
+def write_sample_pdf(path: str, pages: int, lines_per_page: int = 45):
+    """Writes a minimal text-only PDF so the benchmark runs without real uploads."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        body = "".join(f"({LINE} p{page} l{n}) Tj T* " for n in range(lines_per_page))
+        stream = f"BT /F1 10 Tf 14 TL 40 800 Td {body}ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def timed(fn, path: str, repeat: int):
+    best, result = float("inf"), ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(path)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="./uploads/resumes")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "**", "*.pdf"), recursive=True))
+    if not paths:
+        tmp_dir = tempfile.mkdtemp(prefix="bench_parse_")
+        for pages in (1, 3, 20, 100):
+            path = os.path.join(tmp_dir, f"synthetic_{pages}p.pdf")
+            write_sample_pdf(path, pages)
+            paths.append(path)
+        print(f"No PDFs in {args.dir}; using synthetic resumes in {tmp_dir}\n")
+
+    print(f"Budget: {RESUME_MAX_PAGES} pages / {RESUME_MAX_CHARS} chars, best of {args.repeat}\n")
+    print(f"{'file':<32}{'legacy ms':>11}{'chars':>9}{'bounded ms':>12}{'chars':>9}{'speedup':>9}")
+    for path in paths:
+        legacy_ms, legacy_chars = timed(legacy_extract, path, args.repeat)
+        bounded_ms, bounded_chars = timed(extract_pdf_text, path, args.repeat)
+        name = os.path.basename(path)[:31]
+        print(f"{name:<32}{legacy_ms:>11.1f}{legacy_chars:>9}{bounded_ms:>12.1f}{bounded_chars:>9}"
+              f"{legacy_ms / bounded_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
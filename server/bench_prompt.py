@@ -0,0 +1,103 @@
+# bench_prompt.py
+"""
+Offline benchmark for screening prompt construction.
+
+Compares the old unbounded prompt (raw resume + cover letter) with the
+token-budgeted prompt from prompt_builder, and prints a size/latency report.
+No Gemini calls are made; model latency is estimated from the input token count.
+
+    python bench_prompt.py
+    python bench_prompt.py --budget 1000 --resumes-dir ./uploads/resumes --ms-per-1k-tokens 60
+"""
+import argparse
+import glob
+import os
+import time
+
+from models import Application, Job
+from prompt_builder import PROMPT_TOKEN_BUDGET, build_screening_prompt, estimate_tokens
+
+JOB = Job(
+    title="Backend Engineer",
+    role="Engineering",
+    description="Build and run our hiring APIs.",
+    company="Acme",
+    location="Remote",
+    required_skills=["Python", "FastAPI", "PostgreSQL", "Docker"],
+    required_certifications=["AWS Certified Developer"],
+    owner_id="bench",
+)
+
+SECTION_TEMPLATES = {
+    "SUMMARY": "Engineer with a track record of shipping reliable services. ",
+    "EXPERIENCE": "Senior Engineer, Example Corp (2018 - 2023)\nBuilt Python and FastAPI services on PostgreSQL. ",
+    "PROJECTS": "Side project: a static site generator written in Go with a plugin system. ",
+    "EDUCATION": "BSc Computer Science, Example University. ",
+    "INTERESTS": "Hiking, chess, photography and amateur astronomy. ",
+}
+BOILERPLATE = "Page {page} of 20\njane.doe@example.com\nhttps://example.com/jane\n\n\n"
+
+
+def synthetic_resume(pages: int) -> str:
+    """Builds a resume of roughly `pages` pages with PDF-style extraction junk."""
+    parts = ["Curriculum Vitae\nJane Doe\n", "SKILLS\nPython, FastAPI, Docker, Kubernetes, React\n"]
+    parts.append("CERTIFICATIONS\nAWS Certified Developer\n")
+    for page in range(1, pages + 1):
+        for heading, body in SECTION_TEMPLATES.items():
+            parts.append(f"{heading}\n{body * 6}\n")
+        parts.append(BOILERPLATE.format(page=page))
+    return "\n".join(parts)
+
+
+def legacy_prompt(job: Job, app: Application, resume_text: str) -> str:
+    """The prompt as it was built before budgeting (unbounded)."""
+    return (
+        f"Title: {job.title}\nRequired Skills: {', '.join(job.required_skills)}\n"
+        f"Required Certifications: {', '.join(job.required_certifications)}\n"
+        f"Cover Letter: {app.cover_letter}\nClaimed Skills: {', '.join(app.skills)}\n"
+        f"Claimed Certifications: {', '.join(app.certifications)}\n"
+        f"Parsed Resume Text: {resume_text}"
+    )
+
+
+def load_samples(resumes_dir: str):
+    samples = [(f"synthetic {p}p", synthetic_resume(p)) for p in (1, 5, 20, 60)]
+    if resumes_dir:
+        for path in sorted(glob.glob(os.path.join(resumes_dir, "*.txt"))):
+            with open(path, "r", errors="ignore") as f:
+                samples.append((os.path.basename(path), f.read()))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=PROMPT_TOKEN_BUDGET)
+    parser.add_argument("--resumes-dir", default="")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=50.0,
+                        help="Assumed model input latency used for the estimate.")
+    args = parser.parse_args()
+
+    app = Application(
+        job_id="bench", candidate_id="bench", resume_path="", resume_text="",
+        cover_letter="I would love to join the team. " * 200,
+        skills=["Python", "FastAPI"], certifications=["AWS Certified Developer"],
+    )
+
+    print(f"{'sample':<20}{'before tok':>12}{'after tok':>12}{'saved':>8}{'build ms':>10}{'est. saved ms':>15}")
+    total_before = total_after = 0
+    for name, resume in load_samples(args.resumes_dir):
+        before = estimate_tokens(legacy_prompt(JOB, app, resume))
+        start = time.perf_counter()
+        prompt = build_screening_prompt(JOB, app, resume, token_budget=args.budget)
+        build_ms = (time.perf_counter() - start) * 1000
+        after = estimate_tokens(prompt)
+        saved_ms = (before - after) / 1000 * args.ms_per_1k_tokens
+        total_before, total_after = total_before + before, total_after + after
+        print(f"{name:<20}{before:>12}{after:>12}{1 - after / before:>8.0%}{build_ms:>10.2f}{saved_ms:>15.0f}")
+
+    print(f"\nTotal: {total_before} -> {total_after} tokens "
+          f"({1 - total_after / total_before:.0%} smaller) with a budget of {args.budget} tokens.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+# bulk_import.py
+"""
+Bulk import of applications from a ZIP of resumes plus a CSV manifest.
+
+Manifest columns (header row required):
+    resume_file     path of the resume inside the ZIP
+    name, email     the candidate; an account is created if the email is new
+    cover_letter    optional
+    skills          optional, separated by ";"
+    certifications  optional, separated by ";"
+
+The manifest is either a separate file or "manifest.csv" at the root of the ZIP.
+Rows are streamed, resumes are read from the ZIP one entry at a time and rows are
+committed in batches together with a progress checkpoint, so an interrupted
+import can be resumed from the last committed batch. Each created application is
+queued for screening in the same transaction and screened by the workers'
+ScreeningQueue like any other application; the CLI runs one while it imports.
+
+CLI:
+    python bulk_import.py resumes.zip --job-id <job_id> --owner <admin_username> [--manifest m.csv]
+    python bulk_import.py --resume <import_id>
+"""
+import argparse
+import csv
+import io
+import os
+import secrets
+import shutil
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from ai_processing import AI_SCREENING_ENABLED
+from db import engine
+from models import Application, ImportJob, Job, User, Role
+from screening_queue import ScreeningQueue, enqueue_screening
+from security import get_password_hash
+from storage import RESUME_UPLOAD_DIR, discard_resume, store_resume
+
+IMPORT_DIR = os.getenv("IMPORT_DIR", os.path.join(os.path.dirname(RESUME_UPLOAD_DIR), "imports"))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 200))
+IMPORT_MAX_RESUME_BYTES = int(os.getenv("IMPORT_MAX_RESUME_BYTES", 10 * 1024 * 1024))
+# A RUNNING import that has not reported progress for this long is assumed dead.
+IMPORT_STALE_MINUTES = int(os.getenv("IMPORT_STALE_MINUTES", 10))
+MANIFEST_NAME = "manifest.csv"
+REQUIRED_COLUMNS = {"resume_file", "name", "email"}
+ALLOWED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+
+
+class BulkImportError(Exception):
+    """The archive or manifest cannot be imported at all."""
+
+
+def save_upload(source: BinaryIO, import_id: str, suffix: str) -> str:
+    """Copies an uploaded file to IMPORT_DIR in chunks (never fully in memory)."""
+    os.makedirs(IMPORT_DIR, exist_ok=True)
+    path = os.path.join(IMPORT_DIR, f"{import_id}{suffix}")
+    with open(path, "wb") as f:
+        shutil.copyfileobj(source, f, length=1024 * 1024)
+    return path
+
+
+@contextmanager
+def open_manifest(archive: zipfile.ZipFile, manifest_path: Optional[str]) -> Iterator[csv.DictReader]:
+    """Opens the manifest as a streaming csv.DictReader."""
+    if manifest_path:
+        raw = open(manifest_path, "rb")
+    elif MANIFEST_NAME in archive.namelist():
+        raw = archive.open(MANIFEST_NAME)
+    else:
+        raise BulkImportError(f"No manifest given and no {MANIFEST_NAME} in the archive")
+    with raw, io.TextIOWrapper(raw, encoding="utf-8-sig", newline="") as text:
+        reader = csv.DictReader(text)
+        missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+        if missing:
+            raise BulkImportError(f"Manifest is missing columns: {', '.join(sorted(missing))}")
+        yield reader
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(";") if item.strip()]
+
+
+def _read_resume(archive: zipfile.ZipFile, name: str) -> bytes:
+    info = archive.getinfo(name)
+    if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
+        raise ValueError(f"unsupported resume type {name}")
+    if info.file_size > IMPORT_MAX_RESUME_BYTES:
+        raise ValueError(f"{name} is larger than {IMPORT_MAX_RESUME_BYTES} bytes")
+    return archive.read(info)
+
+
+class BatchResult:
+    def __init__(self):
+        self.created: List[str] = []
+        self.skipped = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+
+def _import_batch(
+        session: Session,
+        import_job: ImportJob,
+        archive: zipfile.ZipFile,
+        rows: List[Dict[str, str]],
+        first_row: int,
+        password_hash: str,
+        stored: List[Tuple[str, str]],
+        screen: bool = True,
+) -> BatchResult:
+    """
+    Adds users/applications (and their queued screenings) for one batch of rows (the caller commits).
+    Appends the (key, sha256) of every resume it stores to stored.
+    """
+    result = BatchResult()
+
+    emails = {row["email"].strip() for row in rows if row.get("email")}
+    users = {
+        user.email: user
+        for user in session.exec(select(User).where(User.email.in_(emails))).all()
+    }
+    applied = set(session.exec(
+        select(Application.candidate_id).where(
+            Application.job_id == import_job.job_id,
+            Application.candidate_id.in_([user.id for user in users.values()]),
+        )
+    ).all())
+
+    for offset, row in enumerate(rows):
+        row_number = first_row + offset + 1
+        try:
+            email = (row.get("email") or "").strip()
+            if not email or not row.get("resume_file"):
+                raise ValueError("email and resume_file are required")
+
+            user = users.get(email)
+            if user and user.id in applied:
+                result.skipped += 1
+                continue
+            data = _read_resume(archive, row["resume_file"])
+            key, resume_hash = store_resume(session, data, os.path.splitext(row["resume_file"])[1])
+            stored.append((key, resume_hash))
+            if not user:
+                user = User(
+                    name=(row.get("name") or email).strip(),
+                    username=email,
+                    email=email,
+                    hashed_password=password_hash,
+                    role=Role.CANDIDATE,
+                )
+                session.add(user)
+                users[email] = user
+
+            application = Application(
+                job_id=import_job.job_id,
+                candidate_id=user.id,
+                cover_letter=row.get("cover_letter") or "",
+                skills=_split(row.get("skills")),
+                certifications=_split(row.get("certifications")),
+                resume_path=key,
+                resume_hash=resume_hash,
+                resume_text="",
+                import_id=import_job.id,
+            )
+            session.add(application)
+            if screen:
+                enqueue_screening(session, application.id, import_job.job_id)
+            applied.add(user.id)
+            result.created.append(application.id)
+        except Exception as e:
+            result.failed += 1
+            result.last_error = f"row {row_number}: {e}"
+    return result
+
+
+def _commit_batch(
+        import_job_id: str,
+        archive: zipfile.ZipFile,
+        rows: List[Dict[str, str]],
+        first_row: int,
+        password_hash: str,
+        screen: bool = True,
+) -> BatchResult:
+    """
+    Imports a batch in one transaction together with the progress checkpoint.
+    If the batch conflicts with concurrent writes it is retried row by row.
+    """
+    stored: List[Tuple[str, str]] = []
+    with Session(engine) as session:
+        import_job = session.get(ImportJob, import_job_id)
+        try:
+            result = _import_batch(session, import_job, archive, rows, first_row, password_hash, stored, screen)
+            _record_progress(import_job, result, len(rows))
+            session.add(import_job)
+            session.commit()
+            return result
+        except IntegrityError:
+            session.rollback()
+    if len(rows) == 1:
+        _discard_resumes(stored)
+        with Session(engine) as session:
+            import_job = session.get(ImportJob, import_job_id)
+            result = BatchResult()
+            result.failed, result.last_error = 1, f"row {first_row + 1}: conflicts with existing data"
+            _record_progress(import_job, result, 1)
+            session.add(import_job)
+            session.commit()
+            return result
+
+    combined = BatchResult()
+    for offset, row in enumerate(rows):
+        single = _commit_batch(import_job_id, archive, [row], first_row + offset, password_hash, screen)
+        combined.created += single.created
+        combined.skipped += single.skipped
+        combined.failed += single.failed
+        combined.last_error = single.last_error or combined.last_error
+    # Files the retries stored again are referenced now and kept.
+    _discard_resumes(stored)
+    return combined
+
+
+def _discard_resumes(stored: List[Tuple[str, str]]):
+    """Deletes files written by a rolled-back batch that no application references."""
+    with Session(engine) as session:
+        for key, resume_hash in stored:
+            discard_resume(session, key, resume_hash)
+
+
+def _record_progress(import_job: ImportJob, result: BatchResult, row_count: int):
+    import_job.processed_rows += row_count
+    import_job.created_count += len(result.created)
+    import_job.skipped_count += result.skipped
+    import_job.failed_count += result.failed
+    import_job.last_error = result.last_error or import_job.last_error
+    import_job.updated_at = datetime.utcnow()
+
+
+def _set_status(import_job_id: str, status: str, error: Optional[str] = None, **fields):
+    with Session(engine) as session:
+        import_job = session.get(ImportJob, import_job_id)
+        import_job.status = status
+        import_job.updated_at = datetime.utcnow()
+        if error:
+            import_job.last_error = error
+        for key, value in fields.items():
+            setattr(import_job, key, value)
+        if status in ("COMPLETED", "FAILED"):
+            import_job.finished_at = datetime.utcnow()
+        session.add(import_job)
+        session.commit()
+
+
+def can_resume(import_job: ImportJob) -> bool:
+    """Imports can be resumed unless they finished or are still making progress."""
+    if import_job.status == "COMPLETED":
+        return False
+    if import_job.status != "RUNNING":
+        return True
+    last_seen = import_job.updated_at or import_job.created_at
+    return datetime.utcnow() - last_seen > timedelta(minutes=IMPORT_STALE_MINUTES)
+
+
+def screened_count(session: Session, import_job_id: str) -> int:
+    return session.exec(
+        select(func.count()).select_from(Application).where(
+            Application.import_id == import_job_id,
+            Application.reviewed_at.is_not(None),
+        )
+    ).one()
+
+
+def run_import(
+        import_job_id: str,
+        on_progress: Optional[Callable[[ImportJob], None]] = None,
+        screen: bool = True,
+):
+    """
+    Runs (or resumes) an import. Rows before processed_rows are skipped; applications
+    from earlier batches were queued for screening when they were committed.
+    With screen=False applications are imported without being queued.
+    """
+    with Session(engine) as session:
+        import_job = session.get(ImportJob, import_job_id)
+        if not import_job or not session.get(Job, import_job.job_id):
+            print(f"[Import Error]: Import {import_job_id} or its job not found.")
+            return
+        start_row = import_job.processed_rows
+        archive_path, manifest_path = import_job.archive_path, import_job.manifest_path
+
+    print(f"[Import]: {'Resuming' if start_row else 'Starting'} import {import_job_id} at row {start_row}")
+    try:
+        # Shared by every account this import creates; nobody knows the secret, so
+        # candidates set a password via the reset flow. One bcrypt call per import.
+        password_hash = get_password_hash(secrets.token_urlsafe(32))
+        with zipfile.ZipFile(archive_path) as archive:
+            with open_manifest(archive, manifest_path) as reader:
+                total_rows = sum(1 for _ in reader)
+            _set_status(import_job_id, "RUNNING", total_rows=total_rows, finished_at=None)
+
+            with open_manifest(archive, manifest_path) as reader:
+                batch, first_row = [], start_row
+                for index, row in enumerate(reader):
+                    if index < start_row:
+                        continue
+                    batch.append(row)
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        _finish_batch(import_job_id, archive, batch, first_row, password_hash, screen, on_progress)
+                        first_row += len(batch)
+                        batch = []
+                if batch:
+                    _finish_batch(import_job_id, archive, batch, first_row, password_hash, screen, on_progress)
+
+        _set_status(import_job_id, "COMPLETED")
+        print(f"[Import]: Finished import {import_job_id}")
+    except Exception as e:
+        print(f"[Import Error]: Import {import_job_id} failed: {e}")
+        _set_status(import_job_id, "FAILED", error=str(e))
+
+
+def _finish_batch(import_job_id, archive, batch, first_row, password_hash, screen, on_progress):
+    _commit_batch(import_job_id, archive, batch, first_row, password_hash, screen)
+    if on_progress:
+        with Session(engine) as session:
+            on_progress(session.get(ImportJob, import_job_id))
+
+
+def create_import_job(
+        session: Session,
+        job_id: str,
+        owner_id: str,
+        archive: BinaryIO,
+        manifest: Optional[BinaryIO] = None,
+) -> ImportJob:
+    """Stores the uploaded files and records a QUEUED import."""
+    import_job = ImportJob(job_id=job_id, owner_id=owner_id, archive_path="")
+    import_job.archive_path = save_upload(archive, import_job.id, ".zip")
+    if manifest is not None:
+        import_job.manifest_path = save_upload(manifest, import_job.id, ".csv")
+    if not zipfile.is_zipfile(import_job.archive_path):
+        for path in (import_job.archive_path, import_job.manifest_path):
+            if path:
+                os.remove(path)
+        raise BulkImportError("The uploaded archive is not a ZIP file")
+    session.add(import_job)
+    session.commit()
+    session.refresh(import_job)
+    return import_job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archive", nargs="?", help="ZIP file of resumes")
+    parser.add_argument("--manifest", help="CSV manifest (default: manifest.csv inside the ZIP)")
+    parser.add_argument("--job-id", help="Job the applications are for")
+    parser.add_argument("--owner", help="Username of the admin running the import")
+    parser.add_argument("--resume", metavar="IMPORT_ID", help="Resume an interrupted import")
+    parser.add_argument("--no-screening", action="store_true", help="Import only; do not queue AI screening")
+    args = parser.parse_args()
+
+    if args.resume:
+        import_id = args.resume
+        with Session(engine) as session:
+            import_job = session.get(ImportJob, import_id)
+            if not import_job or not can_resume(import_job):
+                parser.error(f"Import {import_id} not found, finished or still running")
+    else:
+        if not (args.archive and args.job_id and args.owner):
+            parser.error("archive, --job-id and --owner are required unless --resume is given")
+        with Session(engine) as session:
+            owner = session.exec(select(User).where(User.username == args.owner)).first()
+            if not owner or owner.role != Role.ADMIN:
+                parser.error(f"{args.owner} is not an admin")
+            if not session.get(Job, args.job_id):
+                parser.error(f"Job {args.job_id} not found")
+            with open(args.archive, "rb") as archive:
+                manifest = open(args.manifest, "rb") if args.manifest else None
+                try:
+                    import_id = create_import_job(session, args.job_id, owner.id, archive, manifest).id
+                finally:
+                    if manifest:
+                        manifest.close()
+        print(f"Created import {import_id} (use --resume {import_id} to continue after a crash)")
+
+    # Screens the queued applications as batches commit, like an API worker would.
+    queue = ScreeningQueue() if AI_SCREENING_ENABLED and not args.no_screening else None
+
+    def report(import_job: ImportJob):
+        print(f"  {import_job.processed_rows}/{import_job.total_rows} rows: "
+              f"{import_job.created_count} created, {import_job.skipped_count} skipped, "
+              f"{import_job.failed_count} failed")
+        if queue:
+            # submit() blocks while the pool is full, which keeps the import from running ahead.
+            while queue.sweep():
+                pass
+
+    if queue:
+        queue.start()
+    try:
+        run_import(import_id, on_progress=report, screen=not args.no_screening)
+        if queue:
+            queue.wait_idle()
+    finally:
+        if queue:
+            queue.shutdown()
+    with Session(engine) as session:
+        import_job = session.get(ImportJob, import_id)
+        print(f"Import {import_id}: {import_job.status}. Last error: {import_job.last_error or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
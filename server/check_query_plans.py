@@ -0,0 +1,73 @@
+# check_query_plans.py
+"""
+Checks that the hot-path queries are served by indexes (see migration 0003).
+
+Runs EXPLAIN for the application list / filter queries, the login lookup and
+the admin's job list against DATABASE_URL, and exits with status 1 if any of
+them falls back to a full table scan. Meant for Postgres; SQLite (EXPLAIN
+QUERY PLAN) works too.
+
+    alembic upgrade head && python check_query_plans.py
+
+On Postgres sequential scans are switched off for the session, so the result
+does not depend on how many rows the tables hold: the planner only picks a
+Seq Scan when no usable index exists.
+"""
+import re
+import sys
+
+from sqlmodel import select
+
+from db import engine
+from models import Application, Job, User
+
+PLACEHOLDER_ID = "00000000-0000-0000-0000-000000000000"
+
+# (description, table that must not be scanned, statement as issued by main.py)
+HOT_QUERIES = [
+    ("applications for a job", "application",
+     select(Application).where(Application.job_id == PLACEHOLDER_ID)),
+    ("applications for a job by status", "application",
+     select(Application).where(Application.job_id == PLACEHOLDER_ID, Application.status == "PENDING")),
+    ("a candidate's applications", "application",
+     select(Application).where(Application.candidate_id == PLACEHOLDER_ID)),
+    ("login / token user lookup", "user",
+     select(User).where(User.username == "someone")),
+    ("an admin's jobs", "job",
+     select(Job).where(Job.owner_id == PLACEHOLDER_ID)),
+]
+
+
+def explain(connection, statement) -> str:
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        return "\n".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    return "\n".join(row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}"))
+
+
+def full_scan(plan: str, table: str, dialect: str) -> bool:
+    if dialect == "sqlite":
+        # "SEARCH t USING INDEX ..." is a lookup; a bare "SCAN t" reads the whole table.
+        return re.search(rf"^SCAN {table}$", plan, re.MULTILINE) is not None
+    return re.search(rf'Seq Scan on "?{table}"?(\s|$)', plan) is not None
+
+
+def main() -> int:
+    engine.echo = False  # the plans are the output
+    failures = 0
+    with engine.connect() as connection:
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+        for description, table, statement in HOT_QUERIES:
+            plan = explain(connection, statement)
+            scanned = full_scan(plan, table, dialect)
+            failures += scanned
+            print(f"[{'FAIL' if scanned else ' OK '}] {description}")
+            print("\n".join(f"        {line}" for line in plan.splitlines()))
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use an index ({dialect})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
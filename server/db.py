@@ -17,6 +17,7 @@
 
 
 import os
+from sqlalchemy import event
 from sqlmodel import create_engine, SQLModel, Session
 from dotenv import load_dotenv
 
@@ -37,9 +38,29 @@ if "sqlite" in DATABASE_URL:
 # Create the engine with the correct settings
 engine = create_engine(DATABASE_URL, connect_args=connect_args, echo=True)
 
+if engine.dialect.name == "sqlite":
+    # pysqlite only emits BEGIN before DML, so a SAVEPOINT (session.begin_nested())
+    # opened first would run outside a transaction and releasing it would commit.
+    # Emit the BEGIN ourselves in that case (SQLAlchemy's pysqlite SAVEPOINT
+    # workaround, limited to savepoints: BEGIN on every transaction would make
+    # reads hold locks and concurrent read-then-write requests fail as "locked").
+    @event.listens_for(engine, "savepoint")
+    def _sqlite_begin_before_savepoint(connection, name):
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN")
+
+# Connections opened at startup so the first requests skip the connect handshake.
+DB_POOL_WARM_CONNECTIONS = int(os.getenv("DB_POOL_WARM_CONNECTIONS", 2))
+
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
+def warm_pool(connections: int = DB_POOL_WARM_CONNECTIONS):
+    opened = [engine.connect() for _ in range(connections)]
+    for connection in opened:
+        connection.exec_driver_sql("SELECT 1")
+        connection.close()  # back to the pool, still open
+
 def get_session():
     with Session(engine) as session:
         yield session
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Resolves candidates who applied to the same job more than once, which migration
+0002 (one application per job and candidate) refuses to upgrade over.
+
+Lists every duplicate group and the application it would keep: a reviewed one
+over a PENDING one, then the most recent decision, then the earliest submitted.
+Nothing is deleted unless --apply is given; --keep overrides the choice for the
+group that application belongs to.
+
+    python dedupe_applications.py                      # dry run
+    python dedupe_applications.py --keep <app_id> ...  # dry run with overrides
+    python dedupe_applications.py --apply [--keep <app_id> ...]
+    alembic upgrade head
+
+Back up the database before --apply. Resume files of deleted applications are
+left on disk. Only the baseline (pre-0002) columns are used, so this runs
+against a database that has not been upgraded yet.
+"""
+import argparse
+import sys
+from itertools import groupby
+from typing import Dict, List, Set
+
+from sqlalchemy import text
+
+from db import engine
+
+DUPLICATES = text("""
+    SELECT id, job_id, candidate_id, status, submitted_at, reviewed_at FROM application
+    WHERE (job_id, candidate_id) IN (
+        SELECT job_id, candidate_id FROM application
+        GROUP BY job_id, candidate_id HAVING COUNT(*) > 1
+    )
+    ORDER BY job_id, candidate_id, submitted_at, id
+""")
+
+
+def choose(group: List[Dict], keep: Set[str]) -> Dict:
+    """The application of a duplicate group that survives."""
+    for application in group:
+        if application["id"] in keep:
+            return application
+    reviewed = [a for a in group if a["status"] != "PENDING"]
+    if reviewed:
+        return max(reviewed, key=lambda a: (a["reviewed_at"] is not None, a["reviewed_at"] or a["submitted_at"]))
+    return group[0]  # ordered by submitted_at
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep", nargs="*", default=[], metavar="APPLICATION_ID",
+                        help="Keep this application in its group instead of the default choice")
+    parser.add_argument("--apply", action="store_true", help="Delete the other applications of each group")
+    args = parser.parse_args()
+    engine.echo = False  # the listing is the output
+
+    keep = set(args.keep)
+    with engine.begin() as connection:
+        rows = [dict(row._mapping) for row in connection.execute(DUPLICATES)]
+        groups = [list(group) for _, group in groupby(rows, key=lambda a: (a["job_id"], a["candidate_id"]))]
+        unknown = keep - {a["id"] for a in rows}
+        if unknown:
+            parser.error(f"--keep ids are not duplicates: {', '.join(sorted(unknown))}")
+
+        doomed = []
+        for group in groups:
+            kept = choose(group, keep)
+            print(f"job {group[0]['job_id']}, candidate {group[0]['candidate_id']}:")
+            for application in group:
+                action = "keep  " if application is kept else "delete"
+                print(f"  {action} {application['id']}  {application['status']:<9}"
+                      f"  submitted {application['submitted_at']}  reviewed {application['reviewed_at'] or '-'}")
+                if application is not kept:
+                    doomed.append(application["id"])
+
+        if not groups:
+            print("No duplicate applications.")
+        elif args.apply:
+            connection.execute(text("DELETE FROM application WHERE id = :id"), [{"id": i} for i in doomed])
+            print(f"\nDeleted {len(doomed)} applications in {len(groups)} groups.")
+        else:
+            print(f"\nDry run: would delete {len(doomed)} applications in {len(groups)} groups. "
+                  "Re-run with --apply to delete them.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+from sqlmodel import Session, select
+
+from db import engine
+from models import Application, User
+
+# Rows fetched per round trip from the server-side cursor and written per output chunk.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 500))
+
+EXPORT_COLUMNS = [
+    "application_id", "candidate_name", "candidate_email", "status", "ai_reasoning",
+    "skills", "certifications", "submitted_at", "reviewed_at",
+]
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Leading characters that make spreadsheet apps evaluate a CSV cell as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def iter_application_chunks(job_id: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """
+    Yields a job's applications as lists of export rows, chunk_size at a time.
+    yield_per streams from a server-side cursor (on Postgres), so the full result
+    set is never held in memory.
+    """
+    statement = (
+        select(
+            Application.id, User.name, User.email, Application.status, Application.ai_reasoning,
+            Application.skills, Application.certifications,
+            Application.submitted_at, Application.reviewed_at,
+        )
+        .join(User, User.id == Application.candidate_id)
+        .where(Application.job_id == job_id)
+        .order_by(Application.submitted_at, Application.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    # Own session: the response streams after the request's session is closed.
+    with Session(engine) as session:
+        for partition in session.exec(statement).partitions():
+            yield [dict(zip(EXPORT_COLUMNS, row)) for row in partition]
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        value = "; ".join(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Candidate-supplied text: quote it so it is shown, not evaluated.
+        return "'" + value
+    return "" if value is None else value
+
+
+def csv_chunks(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows([_csv_value(row[column]) for column in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(json.dumps(row, default=_json_default) + "\n" for row in rows).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its bytes back to the caller after each row group."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def parquet_chunks(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Writes one Parquet row group per chunk and streams it out as it is written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("application_id", pa.string()),
+        ("candidate_name", pa.string()),
+        ("candidate_email", pa.string()),
+        ("status", pa.string()),
+        ("ai_reasoning", pa.string()),
+        ("skills", pa.list_(pa.string())),
+        ("certifications", pa.list_(pa.string())),
+        ("submitted_at", pa.timestamp("us")),
+        ("reviewed_at", pa.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in chunks:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip-compresses a byte stream incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_applications(job_id: str, export_format: str, gzip: bool = False) -> Iterator[bytes]:
+    """Streams a job's applications in the requested format (csv, ndjson or parquet)."""
+    writers = {"csv": csv_chunks, "ndjson": ndjson_chunks, "parquet": parquet_chunks}
+    body = writers[export_format](iter_application_chunks(job_id))
+    return gzip_chunks(body) if gzip else body
@@ -1,29 +1,44 @@
 import os
+import math
 import json
-import uuid
+import hashlib
+import mimetypes
 import smtplib
+from contextlib import asynccontextmanager
 from email.message import EmailMessage
 from datetime import timedelta
-from typing import Optional, List
+from typing import Optional, List, Literal
 from typing_extensions import Annotated
 from dotenv import load_dotenv
 import jwt
 from fastapi import (
     FastAPI, APIRouter, Depends, HTTPException, status,
-    BackgroundTasks, UploadFile, File, Form, Query
+    BackgroundTasks, UploadFile, File, Form, Query, Request, Response, Header
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from jwt.exceptions import InvalidTokenError
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 # --- Local Imports ---
-from db import get_session, create_db_and_tables, engine
+from db import get_session, create_db_and_tables, engine, warm_pool
 from models import *  # Assuming models.py is in the same directory
 from security import (
     get_password_hash, verify_password, create_access_token,
+    create_resume_token, RESUME_LINK_EXPIRE_SECONDS, RESUME_TOKEN_SCOPE,
 )
-from ai_processing import *
+from ai_processing import AI_SCREENING_ENABLED, warm_model
+from quotas import RateLimiter, quotas
+from screening_queue import ScreeningQueue, enqueue_screening, install_sigterm_handler
+from storage import discard_resume, get_storage, release_resume, reclaim_resume, store_resume
+from exports import EXPORT_MEDIA_TYPES, export_applications, parquet_available
+from bulk_import import (
+    BulkImportError, can_resume, create_import_job, run_import, screened_count,
+)
+from rescreen import RESCREEN_MAX_CONCURRENCY, active_run, create_rescreen, decision_changes, run_rescreen
 
 
 # --- App Setup ---
@@ -42,13 +57,46 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USERNAME)
 SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() != "false"
 
+# Requests per minute, per worker process (0 disables): /token per client IP,
+# /applications/apply per candidate.
+LOGIN_RATE_PER_MINUTE = int(os.getenv("LOGIN_RATE_PER_MINUTE", 10))
+APPLY_RATE_PER_MINUTE = int(os.getenv("APPLY_RATE_PER_MINUTE", 5))
+
+# The schema is managed by Alembic (serve.py runs `alembic upgrade head`).
+# DB_CREATE_ALL=true creates missing tables on startup instead, for throwaway databases.
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+
+# Resume URLs are keyed by content hash, so a given URL always serves the same bytes.
+RESUME_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
 def on_startup():
     """Function to run on app startup."""
-    create_db_and_tables()
+    if DB_CREATE_ALL:
+        create_db_and_tables()
+
 
+# Screens this worker's share of PendingScreening rows (see screening_queue.py).
+screening_queue = ScreeningQueue()
 
-# FIX: Pass the function, don't call it. Use a list.
-app = FastAPI(on_startup=[on_startup])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    on_startup()
+    warm_pool()
+    if AI_SCREENING_ENABLED:
+        warm_model()
+        screening_queue.start()
+        install_sigterm_handler(screening_queue)
+    yield
+    if AI_SCREENING_ENABLED:
+        # Finish or hand off screenings in flight before the pool is closed.
+        await run_in_threadpool(screening_queue.shutdown)
+        # Record this worker's quota usage so other workers and restarts see it.
+        await run_in_threadpool(quotas.flush)
+    engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["*", "https://stroke-diagnoser-jrud.vercel.app/"]
 app.add_middleware(
@@ -63,6 +111,9 @@ app.add_middleware(
 SessionDep = Annotated[Session, Depends(get_session)]
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
+# Links opened by the browser (resume downloads) cannot send headers; they carry a
+# short-lived, single-resume token as ?token= instead (see create_resume_token).
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 
 def send_email(recipient: str, subject: str, body: str):
@@ -142,17 +193,19 @@ def authenticate_user(session: SessionDep, username: str, password: str):
     return user
 
 
-async def get_current_user(token: TokenDep, session: SessionDep) -> User:
-    """Dependency to get the current user from a token."""
+def get_user_from_token(token: Optional[str], session: SessionDep) -> User:
+    """Resolves a JWT to its user, raising 401 if it is missing or invalid."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        if username is None or payload.get("scope"):  # scoped tokens (resume links) are not sessions
             raise credentials_exception
         token_data = TokenData(username=username)
     except InvalidTokenError:
@@ -164,8 +217,44 @@ async def get_current_user(token: TokenDep, session: SessionDep) -> User:
     return user
 
 
+async def get_current_user(token: TokenDep, session: SessionDep) -> User:
+    """Dependency to get the current user from a token."""
+    return get_user_from_token(token, session)
+
+
+async def get_resume_user(
+        resume_hash: str,
+        session: SessionDep,
+        header_token: Annotated[Optional[str], Depends(optional_oauth2_scheme)],
+        token: Optional[str] = None,
+) -> User:
+    """
+    Like get_current_user, but a plain browser link may instead pass ?token= with
+    a resume link token, which is only valid for the resume it was issued for.
+    """
+    if header_token:
+        return get_user_from_token(header_token, session)
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+    )
+    if not token:
+        raise credentials_exception
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except InvalidTokenError:
+        raise credentials_exception
+    if payload.get("scope") != RESUME_TOKEN_SCOPE or payload.get("resume_hash") != resume_hash:
+        raise credentials_exception
+    user = session.get(User, payload.get("sub"))
+    if user is None:
+        raise credentials_exception
+    return user
+
+
 # FIX: Removed redundant get_current_active_user
 CurrentUser = Annotated[User, Depends(get_current_user)]
+ResumeUser = Annotated[User, Depends(get_resume_user)]
 
 
 def get_current_admin(current_user: CurrentUser) -> User:
@@ -181,11 +270,35 @@ def get_current_admin(current_user: CurrentUser) -> User:
 CurrentAdmin = Annotated[User, Depends(get_current_admin)]
 
 
+login_limiter = RateLimiter(LOGIN_RATE_PER_MINUTE)
+apply_limiter = RateLimiter(APPLY_RATE_PER_MINUTE)
+
+
+def enforce_rate_limit(limiter: RateLimiter, key: str):
+    retry_after = limiter.hit(key)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests. Please try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def limit_login_rate(request: Request):
+    """Dependency that throttles login attempts per client IP."""
+    enforce_rate_limit(login_limiter, request.client.host if request.client else "unknown")
+
+
+def limit_apply_rate(current_user: CurrentUser):
+    """Dependency that throttles application submissions per candidate."""
+    enforce_rate_limit(apply_limiter, current_user.id)
+
+
 # -----------------------------------------------------------------
 #  Auth Endpoints (on main app)
 # -----------------------------------------------------------------
 
-@app.post("/token", tags=["Authentication"])
+@app.post("/token", tags=["Authentication"], dependencies=[Depends(limit_login_rate)])
 async def login_for_access_token(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
         session: SessionDep
@@ -363,6 +476,90 @@ def update_job(
 
     return job
 
+
+def rescreen_run_public(session: SessionDep, run: RescreenRun) -> RescreenRunPublic:
+    return RescreenRunPublic(**run.model_dump(), changes=decision_changes(session, run.id))
+
+
+@job_router.post("/{job_id}/rescreen", response_model=RescreenRunPublic, status_code=status.HTTP_202_ACCEPTED)
+def rescreen_job(
+        job_id: str,
+        background_tasks: BackgroundTasks,
+        session: SessionDep,
+        current_admin: CurrentAdmin,
+        rescreen_request: Optional[RescreenRequest] = None,
+):
+    """
+    (Admin Only) Re-runs AI screening for a job's applications, e.g. after its
+    requirements changed. Without filters every AI-decided application is
+    re-screened; statuses set by a recruiter are kept unless include_recruiter_decisions
+    is set. Progress and flipped decisions are polled via GET /jobs/{id}/rescreen/{run_id}.
+    """
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    rescreen_request = rescreen_request or RescreenRequest()
+    concurrency = rescreen_request.concurrency
+    if concurrency is not None and not 1 <= concurrency <= RESCREEN_MAX_CONCURRENCY:
+        raise HTTPException(status_code=400, detail=f"concurrency must be between 1 and {RESCREEN_MAX_CONCURRENCY}.")
+    if not AI_SCREENING_ENABLED:
+        raise HTTPException(status_code=503, detail="AI screening is disabled on this server.")
+    if active_run(session, job_id):
+        raise HTTPException(status_code=409, detail="A re-screen is already running for this job.")
+
+    run = create_rescreen(
+        session, job_id, current_admin.id,
+        statuses=rescreen_request.statuses,
+        application_ids=rescreen_request.application_ids,
+        include_recruiter_decisions=rescreen_request.include_recruiter_decisions,
+        concurrency=concurrency,
+    )
+    background_tasks.add_task(run_rescreen, run.id)
+    return rescreen_run_public(session, run)
+
+
+@job_router.get("/{job_id}/rescreen/{run_id}", response_model=RescreenRunPublic)
+def get_rescreen(job_id: str, run_id: str, session: SessionDep, current_admin: CurrentAdmin):
+    """(Admin Only) Reports a re-screen's progress and the candidates whose decision flipped."""
+    run = session.get(RescreenRun, run_id)
+    if not run or run.job_id != job_id:
+        raise HTTPException(status_code=404, detail="Re-screen not found")
+    return rescreen_run_public(session, run)
+
+
+@job_router.get("/{job_id}/applications/export")
+def export_job_applications(
+        job_id: str,
+        request: Request,
+        session: SessionDep,
+        current_admin: CurrentAdmin,
+        format: Literal["csv", "ndjson", "parquet"] = "csv",
+):
+    """
+    (Admin Only) Streams every application for a job with its AI decision.
+    Rows are read from a server-side cursor in chunks; the response is gzip
+    encoded when the client accepts it.
+    """
+    job = session.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow on the server.")
+
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    headers = {
+        "Content-Disposition": f'attachment; filename="applications-{job_id}.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_applications(job_id, format, gzip=use_gzip),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
 @job_router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_job(
         job_id: str,
@@ -383,7 +580,63 @@ def delete_job(
 app_router = APIRouter(prefix="/applications", tags=["Applications"])
 
 
-@app_router.post("/apply/{job_id}", response_model=ApplicationPublic)
+def application_fingerprint(
+        job_id: str,
+        cover_letter: str,
+        skills: List[str],
+        certifications: List[str],
+        resume_hash: str,
+) -> str:
+    """Hash of everything that makes up an application request."""
+    payload = json.dumps([job_id, cover_letter, skills, certifications, resume_hash])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def find_idempotent_replay(
+        session: SessionDep,
+        user_id: str,
+        idempotency_key: Optional[str],
+        fingerprint: str,
+) -> Optional[Application]:
+    """
+    Returns the application created earlier with this Idempotency-Key, if any.
+    Reusing a key for a different request is a client error.
+    """
+    if not idempotency_key:
+        return None
+    record = session.exec(
+        select(IdempotencyRecord).where(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.key == idempotency_key,
+        )
+    ).first()
+    if not record:
+        return None
+    if record.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different application."
+        )
+    return session.get(Application, record.application_id)
+
+
+def duplicate_application_error(session: SessionDep, job_id: str, candidate_id: str) -> Optional[HTTPException]:
+    """Builds the 409 returned when the candidate already applied to this job (None if not)."""
+    existing = session.exec(
+        select(Application).where(
+            Application.job_id == job_id,
+            Application.candidate_id == candidate_id,
+        )
+    ).first()
+    if not existing:
+        return None
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="You have already applied to this job.",
+    )
+
+
+@app_router.post("/apply/{job_id}", response_model=ApplicationPublic, dependencies=[Depends(limit_apply_rate)])
 async def submit_application(
         job_id: str,
         background_tasks: BackgroundTasks,
@@ -394,24 +647,36 @@ async def submit_application(
         skills: List[str] = Form(...),  # '["skill1", "skill2"]'
         certifications: List[str] = Form(...),  # '["cert1"]"
         # --- File Upload ---
-        resume_file: UploadFile = File(...)
+        resume_file: UploadFile = File(...),
+        idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
 ):
-    """(Candidate Only) Submits a new application for a specific job."""
+    """
+    (Candidate Only) Submits a new application for a specific job.
+    Retries with the same Idempotency-Key return the original application without
+    storing the file again or scheduling another screening.
+    """
     job = session.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # FIX: Secure file handling with unique names
-    uploads_dir = "./uploads/resumes"
-    os.makedirs(uploads_dir, exist_ok=True)
-    file_extension = os.path.splitext(resume_file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    resume_path = os.path.join(uploads_dir, unique_filename)
+    resume_data = await resume_file.read()
+    resume_hash = hashlib.sha256(resume_data).hexdigest()
+    fingerprint = application_fingerprint(job_id, cover_letter, skills, certifications, resume_hash)
+
+    # --- Replays and duplicates are answered before touching storage ---
+    replayed = find_idempotent_replay(session, current_user.id, idempotency_key, fingerprint)
+    if replayed:
+        return replayed
+    conflict = duplicate_application_error(session, job_id, current_user.id)
+    if conflict:
+        raise conflict
 
     try:
-        with open(resume_path, "wb") as f:
-            f.write(await resume_file.read())
+        resume_path, resume_hash = store_resume(
+            session, resume_data, os.path.splitext(resume_file.filename)[1], resume_hash
+        )
     except Exception as e:
+        session.rollback()
         raise HTTPException(status_code=500, detail=f"Could not save file: {e}")
 
     # --- Create Application ---
@@ -423,22 +688,45 @@ async def submit_application(
             skills=skills,
             certifications=certifications,
             resume_path=resume_path,
+            resume_hash=resume_hash,
             status="PENDING",
             resume_text=""  # Will be filled by background task
         )
 
         session.add(db_app)
+        if idempotency_key:
+            session.add(IdempotencyRecord(
+                user_id=current_user.id,
+                key=idempotency_key,
+                fingerprint=fingerprint,
+                application_id=db_app.id,
+            ))
+        # Durable: survives a restart before the screening runs.
+        enqueue_screening(session, db_app.id, job_id)
         session.commit()
         session.refresh(db_app)
 
         # --- Add the slow AI task to the background ---
-        background_tasks.add_task(run_ai_screening, db_app.id, db_app.job_id)
+        # (API-only workers only queue it; a screening worker's sweep picks it up.)
+        if AI_SCREENING_ENABLED:
+            background_tasks.add_task(screening_queue.submit, db_app.id, db_app.job_id)
 
         return db_app
+    except IntegrityError:
+        # Lost a race against a concurrent retry of the same request.
+        session.rollback()
+        discard_resume(session, resume_path, resume_hash)
+        replayed = find_idempotent_replay(session, current_user.id, idempotency_key, fingerprint)
+        if replayed:
+            return replayed
+        raise duplicate_application_error(session, job_id, current_user.id) or HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Conflicting application."
+        )
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON format for skills or certifications.")
     except Exception as e:
         session.rollback()
+        discard_resume(session, resume_path, resume_hash)
         raise HTTPException(status_code=500, detail=f"Error creating application: {e}")
 
 
@@ -460,8 +748,25 @@ def delete_application(
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
 
+    resume_key = db_app.resume_path
+    records = session.exec(
+        select(IdempotencyRecord).where(IdempotencyRecord.application_id == application_id)
+    ).all()
+    for record in records:
+        session.delete(record)
+    history = session.exec(
+        select(DecisionHistory).where(DecisionHistory.application_id == application_id)
+    ).all()
+    for entry in history:
+        session.delete(entry)
+    pending = session.get(PendingScreening, application_id)
+    if pending:
+        session.delete(pending)
     session.delete(db_app)
+    unreferenced = release_resume(session, resume_key)
     session.commit()
+    if unreferenced:
+        reclaim_resume(session, resume_key)
     return None
 @app_router.get("/me", response_model=ApplicationsPublic)
 def get_my_applications(session: SessionDep, current_user: CurrentUser):
@@ -489,6 +794,17 @@ def update_application_status(
     if not update_data:
         return application
 
+    new_status = update_data.get("status")
+    if new_status:
+        # A recruiter's decision: AI screenings and default re-screens leave it alone.
+        session.add(DecisionHistory(
+            application_id=application.id,
+            previous_status=application.status,
+            status=new_status,
+            decided_by=admin.id,
+        ))
+        application.decided_by = admin.id
+
     for field, value in update_data.items():
         setattr(application, field, value)
 
@@ -497,7 +813,6 @@ def update_application_status(
     session.refresh(application)
     session.refresh(application, attribute_names=["job", "candidate"])
 
-    new_status = update_data.get("status")
     if new_status:
         email_content = build_status_email(application, new_status)
         if email_content:
@@ -512,12 +827,144 @@ def update_application_status(
     return application
 
 
+# -----------------------------------------------------------------
+#  Bulk Import Endpoints
+# -----------------------------------------------------------------
+import_router = APIRouter(prefix="/imports", tags=["Imports"])
+
+
+def import_job_public(session: SessionDep, import_job: ImportJob) -> ImportJobPublic:
+    return ImportJobPublic(
+        **import_job.model_dump(),
+        screened_count=screened_count(session, import_job.id),
+    )
+
+
+@import_router.post("/", response_model=ImportJobPublic, status_code=status.HTTP_202_ACCEPTED)
+def start_import(
+        background_tasks: BackgroundTasks,
+        session: SessionDep,
+        current_admin: CurrentAdmin,
+        job_id: str = Form(...),
+        archive: UploadFile = File(...),  # ZIP of resumes
+        manifest: Optional[UploadFile] = File(None),  # CSV; defaults to manifest.csv in the ZIP
+):
+    """(Admin Only) Imports applications in bulk; progress is polled via GET /imports/{id}."""
+    if not session.get(Job, job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        import_job = create_import_job(
+            session, job_id, current_admin.id, archive.file, manifest.file if manifest else None
+        )
+    except BulkImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    background_tasks.add_task(run_import, import_job.id)
+    return import_job_public(session, import_job)
+
+
+@import_router.get("/{import_id}", response_model=ImportJobPublic)
+def get_import(import_id: str, session: SessionDep, current_admin: CurrentAdmin):
+    """(Admin Only) Reports the progress of a bulk import."""
+    import_job = session.get(ImportJob, import_id)
+    if not import_job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return import_job_public(session, import_job)
+
+
+@import_router.post("/{import_id}/resume", response_model=ImportJobPublic, status_code=status.HTTP_202_ACCEPTED)
+def resume_import(
+        import_id: str,
+        background_tasks: BackgroundTasks,
+        session: SessionDep,
+        current_admin: CurrentAdmin
+):
+    """(Admin Only) Continues an interrupted import from its last committed batch."""
+    import_job = session.get(ImportJob, import_id)
+    if not import_job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if not can_resume(import_job):
+        raise HTTPException(status_code=409, detail=f"Import is {import_job.status.lower()} and cannot be resumed.")
+
+    background_tasks.add_task(run_import, import_job.id)
+    return import_job_public(session, import_job)
+
+
+# -----------------------------------------------------------------
+#  Resume Endpoints
+# -----------------------------------------------------------------
+resume_router = APIRouter(prefix="/resumes", tags=["Resumes"])
+
+
+def find_resume_application(session: Session, resume_hash: str, user: User) -> Application:
+    """An application with this resume that the user may see (admins see all), or 404."""
+    query = select(Application).where(Application.resume_hash == resume_hash)
+    if user.role != Role.ADMIN:
+        query = query.where(Application.candidate_id == user.id)
+    application = session.exec(query).first()
+    if not application:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return application
+
+
+@resume_router.post("/{resume_hash}/link", response_model=ResumeLink)
+def create_resume_link(resume_hash: str, session: SessionDep, current_user: CurrentUser):
+    """
+    (Admin, or the Candidate who uploaded it) Returns a download URL for a plain
+    browser link. Its token only opens this resume and expires after
+    RESUME_LINK_EXPIRE_SECONDS, so the session token never appears in a URL.
+    """
+    find_resume_application(session, resume_hash, current_user)
+    token = create_resume_token(current_user.id, resume_hash)
+    return ResumeLink(url=f"/resumes/{resume_hash}?token={token}", expires_in=RESUME_LINK_EXPIRE_SECONDS)
+
+
+@resume_router.get("/{resume_hash}")
+def download_resume(
+        resume_hash: str,
+        request: Request,
+        session: SessionDep,
+        current_user: ResumeUser,
+):
+    """
+    (Admin, or the Candidate who uploaded it) Downloads a resume by content hash.
+    Supports Range requests for progressive PDF loading; the hash doubles as a
+    strong ETag, so the response can be cached forever.
+    """
+    application = find_resume_application(session, resume_hash, current_user)
+
+    storage = get_storage()
+    resume_path = storage.filesystem_path(application.resume_path)
+    if resume_path is None:
+        # Remote backends hand out a short-lived URL; S3 handles Range/ETag itself.
+        download_url = storage.download_url(application.resume_path)
+        if download_url is None:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        return RedirectResponse(download_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    etag = f'"{resume_hash}"'
+    headers = {"ETag": etag, "Cache-Control": RESUME_CACHE_CONTROL}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    file_extension = os.path.splitext(resume_path)[1]
+    return FileResponse(
+        resume_path,
+        media_type=mimetypes.guess_type(resume_path)[0] or "application/octet-stream",
+        filename=f"resume{file_extension}",
+        content_disposition_type="inline",
+        headers=headers,
+    )
+
+
 # --- Add all routers to the main app ---
 app.include_router(user_router)
 app.include_router(job_router)
 app.include_router(app_router)
+app.include_router(resume_router)
+app.include_router(import_router)
 
 if __name__ == "__main__":
-    import uvicorn
+    from serve import main as serve
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    serve()
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""resume storage, candidate profiles, imports, re-screens and the screening queue
+
+Tables and application columns added on top of the baseline:
+  - resumeblob, candidateprofile, importjob, rescreenrun, decisionhistory,
+    idempotencyrecord and pendingscreening
+  - application.resume_hash / profile_id / import_id / decided_by. Existing
+    decisions cannot be told apart, so non-PENDING applications are attributed
+    to the job's owner and kept by default re-screens.
+  - UNIQUE (application.job_id, candidate_id). If a candidate applied to a job
+    more than once the upgrade stops and lists the pairs; resolve them with
+    dedupe_applications.py, then upgrade again.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:41:02.047756
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The unique constraint added below needs one application per (job_id, candidate_id).
+    # Which duplicate to keep is an admin's call (a later one may hold a recruiter's
+    # decision), so stop before changing anything instead of deleting any.
+    if not op.get_context().as_sql:
+        duplicates = op.get_bind().execute(sa.text("""
+            SELECT job_id, candidate_id, COUNT(*) FROM application
+            GROUP BY job_id, candidate_id HAVING COUNT(*) > 1
+            ORDER BY job_id, candidate_id
+        """)).all()
+        if duplicates:
+            listing = "\n".join(
+                f"  job {job_id}, candidate {candidate_id}: {count} applications"
+                for job_id, candidate_id, count in duplicates
+            )
+            raise RuntimeError(
+                f"{len(duplicates)} candidate(s) applied to the same job more than once:\n{listing}\n"
+                "Resolve them with `python dedupe_applications.py` (dry run by default), "
+                "then run `alembic upgrade head` again."
+            )
+
+    op.create_table('resumeblob',
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('resume_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_resumeblob_resume_hash'), 'resumeblob', ['resume_hash'], unique=False)
+
+    op.create_table('candidateprofile',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('resume_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('skills', sa.JSON(), nullable=True),
+    sa.Column('certifications', sa.JSON(), nullable=True),
+    sa.Column('titles', sa.JSON(), nullable=True),
+    sa.Column('education', sa.JSON(), nullable=True),
+    sa.Column('years_experience', sa.Float(), nullable=True),
+    sa.Column('resume_text', sa.TEXT(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'resume_hash')
+    )
+    op.create_index(op.f('ix_candidateprofile_resume_hash'), 'candidateprofile', ['resume_hash'], unique=False)
+    op.create_index(op.f('ix_candidateprofile_user_id'), 'candidateprofile', ['user_id'], unique=False)
+
+    op.create_table('importjob',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('job_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('owner_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('archive_path', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('manifest_path', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=False),
+    sa.Column('processed_rows', sa.Integer(), nullable=False),
+    sa.Column('created_count', sa.Integer(), nullable=False),
+    sa.Column('skipped_count', sa.Integer(), nullable=False),
+    sa.Column('failed_count', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.TEXT(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('rescreenrun',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('job_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('requested_by', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('statuses', sa.JSON(), nullable=True),
+    sa.Column('application_ids', sa.JSON(), nullable=True),
+    sa.Column('include_recruiter_decisions', sa.Boolean(), nullable=False),
+    sa.Column('concurrency', sa.Integer(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('processed', sa.Integer(), nullable=False),
+    sa.Column('flipped', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.TEXT(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ),
+    sa.ForeignKeyConstraint(['requested_by'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rescreenrun_job_id'), 'rescreenrun', ['job_id'], unique=False)
+
+    op.create_table('decisionhistory',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('application_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('run_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('previous_status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('reasoning', sa.TEXT(), nullable=True),
+    sa.Column('decided_by', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['application.id'], ),
+    sa.ForeignKeyConstraint(['decided_by'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['run_id'], ['rescreenrun.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_decisionhistory_application_id'), 'decisionhistory', ['application_id'], unique=False)
+    op.create_index(op.f('ix_decisionhistory_run_id'), 'decisionhistory', ['run_id'], unique=False)
+
+    op.create_table('idempotencyrecord',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('user_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('fingerprint', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('application_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['application.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'key')
+    )
+    op.create_table('pendingscreening',
+    sa.Column('application_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('job_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('claimed_by', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('claimed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['application.id'], ),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ),
+    sa.PrimaryKeyConstraint('application_id')
+    )
+
+    with op.batch_alter_table('application', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('profile_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('import_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('decided_by', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_application_import_id'), ['import_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_application_resume_hash'), ['resume_hash'], unique=False)
+        batch_op.create_unique_constraint('application_job_id_candidate_id_key', ['job_id', 'candidate_id'])
+        batch_op.create_foreign_key('application_import_id_fkey', 'importjob', ['import_id'], ['id'])
+        batch_op.create_foreign_key('application_profile_id_fkey', 'candidateprofile', ['profile_id'], ['id'])
+        batch_op.create_foreign_key('application_decided_by_fkey', 'user', ['decided_by'], ['id'])
+
+    # Nothing records whether an existing decision came from the AI or a recruiter, so
+    # treat them as the job owner's: re-screens keep them unless asked to include them.
+    op.execute("""
+        UPDATE application SET decided_by = (SELECT owner_id FROM job WHERE job.id = application.job_id)
+        WHERE status != 'PENDING'
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('application', schema=None) as batch_op:
+        batch_op.drop_constraint('application_decided_by_fkey', type_='foreignkey')
+        batch_op.drop_constraint('application_profile_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('application_import_id_fkey', type_='foreignkey')
+        batch_op.drop_constraint('application_job_id_candidate_id_key', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_application_resume_hash'))
+        batch_op.drop_index(batch_op.f('ix_application_import_id'))
+        batch_op.drop_column('decided_by')
+        batch_op.drop_column('import_id')
+        batch_op.drop_column('profile_id')
+        batch_op.drop_column('resume_hash')
+
+    op.drop_table('pendingscreening')
+    op.drop_table('idempotencyrecord')
+    op.drop_index(op.f('ix_decisionhistory_run_id'), table_name='decisionhistory')
+    op.drop_index(op.f('ix_decisionhistory_application_id'), table_name='decisionhistory')
+    op.drop_table('decisionhistory')
+    op.drop_index(op.f('ix_rescreenrun_job_id'), table_name='rescreenrun')
+    op.drop_table('rescreenrun')
+    op.drop_table('importjob')
+    op.drop_index(op.f('ix_candidateprofile_user_id'), table_name='candidateprofile')
+    op.drop_index(op.f('ix_candidateprofile_resume_hash'), table_name='candidateprofile')
+    op.drop_table('candidateprofile')
+    op.drop_index(op.f('ix_resumeblob_resume_hash'), table_name='resumeblob')
+    op.drop_table('resumeblob')
@@ -0,0 +1,47 @@
+"""hot path indexes
+
+Indexes for the filters every request path uses:
+  - application (job_id, status): a job's applications, optionally by status
+    (admin listing, exports, re-screens); job_id alone is served by its prefix
+  - application.candidate_id: a candidate's own applications
+  - user.username: login and token authentication on every request
+  - job.owner_id: an admin's jobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:13:55.935321
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_application_job_id_status', 'application', ['job_id', 'status']),
+    ('ix_application_candidate_id', 'application', ['candidate_id']),
+    ('ix_user_username', 'user', ['username']),
+    ('ix_job_owner_id', 'job', ['owner_id']),
+]
+
+
+def upgrade() -> None:
+    # On Postgres, CONCURRENTLY builds each index without blocking writes to the
+    # table; it cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
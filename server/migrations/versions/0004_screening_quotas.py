@@ -0,0 +1,42 @@
+"""screening quotas
+
+Adds quotausage (per-window screening and token usage shared by all workers)
+and pendingscreening.not_before, so screenings deferred by a quota wait their turn.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:18:32.185744
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('quotausage',
+    sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('metric', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('window_start', sa.DateTime(), nullable=False),
+    sa.Column('used', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'key', 'metric', 'window_start')
+    )
+    with op.batch_alter_table('pendingscreening', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('not_before', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('pendingscreening', schema=None) as batch_op:
+        batch_op.drop_column('not_before')
+
+    op.drop_table('quotausage')
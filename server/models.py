@@ -2,7 +2,7 @@
 
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
 # --- Add this import ---
-from sqlalchemy import TEXT, Column as sa_Column
+from sqlalchemy import TEXT, Column as sa_Column, Index, UniqueConstraint
 # --- End add ---
 
 from datetime import datetime
@@ -26,7 +26,7 @@ class Role(str, Enum):
 
 class UserBase(SQLModel):
     name: str
-    username: str
+    username: str = Field(index=True)  # login lookup
     email: str = Field(unique=True, index=True)
 
 
@@ -82,22 +82,32 @@ class User(UserBase, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     jobs: List["Job"] = Relationship(back_populates="owner")
-    applications: List["Application"] = Relationship(back_populates="candidate")
+    applications: List["Application"] = Relationship(
+        back_populates="candidate", sa_relationship_kwargs={"foreign_keys": "Application.candidate_id"}
+    )
+    profiles: List["CandidateProfile"] = Relationship(back_populates="user")
 
 
 class Job(JobBase, table=True):
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    owner_id: str = Field(foreign_key="user.id")
+    owner_id: str = Field(foreign_key="user.id", index=True)
 
     owner: User = Relationship(back_populates="jobs")
     applications: List["Application"] = Relationship(back_populates="job")
 
 
 class Application(ApplicationBase, table=True):
+    __table_args__ = (
+        # A candidate can apply to each job once.
+        UniqueConstraint("job_id", "candidate_id"),
+        # A job's applications, optionally by status (listing, re-screens, exports).
+        Index("ix_application_job_id_status", "job_id", "status"),
+    )
+
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     job_id: str = Field(foreign_key="job.id")
-    candidate_id: str = Field(foreign_key="user.id")
+    candidate_id: str = Field(foreign_key="user.id", index=True)
 
     # --- System-Set Fields ---
     status: str = Field(default="PENDING", index=True)
@@ -105,6 +115,9 @@ class Application(ApplicationBase, table=True):
 
     # --- FIX 2 ---
     resume_text: str = Field(sa_column=sa_Column(TEXT))
+    resume_hash: Optional[str] = Field(default=None, index=True)
+    profile_id: Optional[str] = Field(default=None, foreign_key="candidateprofile.id")
+    import_id: Optional[str] = Field(default=None, foreign_key="importjob.id", index=True)
 
     # --- FIX 3 ---
     ai_reasoning: Optional[str] = Field(default=None, sa_column=sa_Column(TEXT))
@@ -112,9 +125,144 @@ class Application(ApplicationBase, table=True):
 
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
     reviewed_at: Optional[datetime] = Field(default=None)
+    # Admin who set the current status by hand; None while the status is the AI's.
+    # AI screenings and default re-screens never overwrite a recruiter's decision.
+    decided_by: Optional[str] = Field(default=None, foreign_key="user.id")
 
     job: Job = Relationship(back_populates="applications")
-    candidate: User = Relationship(back_populates="applications")
+    candidate: User = Relationship(
+        back_populates="applications", sa_relationship_kwargs={"foreign_keys": "Application.candidate_id"}
+    )
+    profile: Optional["CandidateProfile"] = Relationship()
+
+
+class CandidateProfile(SQLModel, table=True):
+    """Structured data extracted once per distinct resume file (keyed by its SHA-256)."""
+    __table_args__ = (UniqueConstraint("user_id", "resume_hash"),)
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    user_id: str = Field(foreign_key="user.id", index=True)
+    resume_hash: str = Field(index=True)
+
+    skills: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    certifications: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    titles: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    education: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    years_experience: Optional[float] = Field(default=None)
+
+    # Normalized resume text, so later applications never re-parse the file.
+    resume_text: str = Field(default="", sa_column=sa_Column(TEXT))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    user: User = Relationship(back_populates="profiles")
+
+
+class ImportJob(SQLModel, table=True):
+    """A bulk import of applications from a ZIP of resumes + CSV manifest (see bulk_import.py)."""
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    job_id: str = Field(foreign_key="job.id")
+    owner_id: str = Field(foreign_key="user.id")
+    archive_path: str
+    manifest_path: Optional[str] = Field(default=None)
+
+    status: str = Field(default="QUEUED")  # QUEUED -> RUNNING -> COMPLETED | FAILED
+    total_rows: int = Field(default=0)
+    # Manifest rows fully committed; an interrupted import restarts after this row.
+    processed_rows: int = Field(default=0)
+    created_count: int = Field(default=0)
+    skipped_count: int = Field(default=0)
+    failed_count: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None, sa_column=sa_Column(TEXT))
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+
+
+class RescreenRun(SQLModel, table=True):
+    """A re-evaluation of a job's applications, e.g. after its requirements changed (see rescreen.py)."""
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    job_id: str = Field(foreign_key="job.id", index=True)
+    requested_by: str = Field(foreign_key="user.id")
+
+    # Filters: only applications in these statuses / with these ids (None = no filter).
+    statuses: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
+    application_ids: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
+    # Also re-screen applications a recruiter decided by hand, replacing their decision.
+    include_recruiter_decisions: bool = Field(default=False)
+    concurrency: int
+
+    status: str = Field(default="QUEUED")  # QUEUED -> RUNNING -> COMPLETED | FAILED
+    total: int = Field(default=0)
+    processed: int = Field(default=0)
+    flipped: int = Field(default=0)  # decision differs from the one before the re-screen
+    failed: int = Field(default=0)  # screening errored; the previous decision was kept
+    last_error: Optional[str] = Field(default=None, sa_column=sa_Column(TEXT))
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+
+
+class DecisionHistory(SQLModel, table=True):
+    """
+    One decision for an application: the AI's (decided_by None; run_id is set when it
+    came from a re-screen) or a recruiter's status change (decided_by is the admin).
+    """
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    application_id: str = Field(foreign_key="application.id", index=True)
+    run_id: Optional[str] = Field(default=None, foreign_key="rescreenrun.id", index=True)
+    previous_status: str
+    status: str
+    reasoning: Optional[str] = Field(default=None, sa_column=sa_Column(TEXT))
+    decided_by: Optional[str] = Field(default=None, foreign_key="user.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PendingScreening(SQLModel, table=True):
+    """
+    An AI screening that has been requested but has not finished (see screening_queue.py).
+    Written in the same transaction as the application, and deleted once the screening
+    completes, so a shutdown or crash never loses one.
+    """
+    application_id: str = Field(foreign_key="application.id", primary_key=True)
+    job_id: str = Field(foreign_key="job.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Worker currently screening it; None means any worker may claim it.
+    claimed_by: Optional[str] = Field(default=None)
+    claimed_at: Optional[datetime] = Field(default=None)
+    # Set when the screening was deferred by a quota: not claimed before this time.
+    not_before: Optional[datetime] = Field(default=None)
+
+
+class QuotaUsage(SQLModel, table=True):
+    """Screenings / tokens used by a job or an admin in one quota window (see quotas.py)."""
+    scope: str = Field(primary_key=True)  # "owner" or "job"
+    key: str = Field(primary_key=True)  # user id or job id
+    metric: str = Field(primary_key=True)  # "screenings" or "tokens"
+    window_start: datetime = Field(primary_key=True)
+    used: int = Field(default=0)
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """Remembers which application an Idempotency-Key produced, so retries replay it."""
+    __table_args__ = (UniqueConstraint("user_id", "key"),)
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    user_id: str = Field(foreign_key="user.id")
+    key: str
+    fingerprint: str
+    application_id: str = Field(foreign_key="application.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ResumeBlob(SQLModel, table=True):
+    """A stored resume file (see storage.py) and how many applications reference it."""
+    key: str = Field(primary_key=True)
+    resume_hash: str = Field(index=True)
+    size: int
+    ref_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 # -----------------
@@ -130,6 +278,11 @@ class TokenData(BaseModel):
     username: str | None = None
 
 
+class ResumeLink(BaseModel):
+    url: str  # relative to the API, e.g. /resumes/<hash>?token=...
+    expires_in: int  # seconds
+
+
 class UserPublic(UserBase):
     id: str
     role: Role
@@ -153,6 +306,7 @@ class ApplicationPublic(ApplicationBase):
     id: str
     status: str
     resume_path: str
+    resume_hash: Optional[str] = None
     resume_text: str
     ai_reasoning: Optional[str]
     submitted_at: datetime
@@ -166,6 +320,57 @@ class ApplicationsPublic(BaseModel):
     data: List[ApplicationPublic]
 
 
+class ImportJobPublic(BaseModel):
+    id: str
+    job_id: str
+    status: str
+    total_rows: int
+    processed_rows: int
+    created_count: int
+    skipped_count: int
+    failed_count: int
+    screened_count: int
+    last_error: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+class RescreenRequest(BaseModel):
+    # Defaults to the AI-set statuses. Applications a recruiter decided by hand are
+    # skipped whatever the filters, unless include_recruiter_decisions is set.
+    statuses: Optional[List[str]] = None
+    application_ids: Optional[List[str]] = None
+    include_recruiter_decisions: bool = False
+    concurrency: Optional[int] = None
+
+
+class DecisionChange(BaseModel):
+    application_id: str
+    candidate_name: str
+    previous_status: str
+    status: str
+    reasoning: Optional[str]
+
+
+class RescreenRunPublic(BaseModel):
+    id: str
+    job_id: str
+    status: str
+    statuses: Optional[List[str]]
+    include_recruiter_decisions: bool
+    concurrency: int
+    total: int
+    processed: int
+    flipped: int
+    failed: int
+    last_error: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    changes: List[DecisionChange] = []
+
+
 # In the Models section of main.py
 
 class JobUpdate(SQLModel):
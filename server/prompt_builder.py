@@ -0,0 +1,261 @@
+import os
+import re
+from typing import List, Optional, Tuple
+
+from models import Application, CandidateProfile, Job
+
+
+# --- Prompt Budget ---
+# Roughly how many tokens the candidate-supplied text (resume + cover letter)
+# may take up in a screening prompt. The fixed instructions are not counted.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 1500))
+# Share of the budget reserved for the cover letter; the resume gets the rest.
+COVER_LETTER_BUDGET_SHARE = float(os.getenv("COVER_LETTER_BUDGET_SHARE", 0.25))
+# Gemini averages ~4 characters per token on English prose.
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = " [...]"
+
+# Headings we recognise in resumes, mapped to a canonical section name.
+SECTION_HEADINGS = {
+    "skills": [
+        "skills", "technical skills", "core skills", "key skills", "competencies",
+        "core competencies", "technologies", "tech stack", "tools",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history",
+    ],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses & certifications",
+        "licenses and certifications", "accreditations",
+    ],
+    "projects": ["projects", "personal projects", "selected projects"],
+    "education": ["education", "academic background", "qualifications"],
+    "summary": ["summary", "profile", "professional summary", "about me", "objective"],
+    "other": [
+        "interests", "hobbies", "references", "languages", "volunteering",
+        "awards", "publications",
+    ],
+}
+
+# Base relevance of each section before keyword matches are counted.
+SECTION_WEIGHTS = {
+    "skills": 5.0,
+    "certifications": 4.0,
+    "experience": 4.0,
+    "summary": 2.0,
+    "projects": 2.0,
+    "education": 1.0,
+    "other": 0.0,
+}
+
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+# Lines that carry no signal for screening (page furniture, contact details).
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^page\s+\d+(\s+of\s+\d+)?$", re.IGNORECASE),
+    re.compile(r"^\d+\s*/\s*\d+$"),
+    re.compile(r"^(curriculum vitae|resume|résumé|cv)$", re.IGNORECASE),
+    re.compile(r"^references (are )?available (up)?on request\.?$", re.IGNORECASE),
+    re.compile(r"^[\W_]+$"),
+    re.compile(r"^\S+@\S+\.\S+$"),
+    re.compile(r"^(https?://|www\.)\S+$", re.IGNORECASE),
+    re.compile(r"^((tel|phone|mobile)[:\s]*|\+)[\d\s().-]{7,}$", re.IGNORECASE),
+]
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\ufffd]")
+_HYPHENATED_BREAK = re.compile(r"(\w)-\n(\w)")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting (no tokenizer round-trip)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def normalize_whitespace(text: str) -> str:
+    """Removes PDF extraction junk and collapses runs of whitespace."""
+    if not text:
+        return ""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _CONTROL_CHARS.sub("", text)
+    text = _HYPHENATED_BREAK.sub(r"\1\2", text)
+    text = _INLINE_SPACE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def strip_boilerplate(text: str) -> str:
+    """Drops lines that never help a screening decision (page numbers, contact info...)."""
+    kept = [
+        line for line in text.split("\n")
+        if not any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+    ]
+    return "\n".join(kept)
+
+
+def _match_heading(line: str) -> Optional[str]:
+    """Returns the canonical section name if the line looks like a heading."""
+    if not line or len(line) > 40:
+        return None
+    candidate = line.strip(" :-•|").lower()
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def extract_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Splits resume text into (section, body) pairs in document order.
+    Anything before the first recognised heading is treated as the summary.
+    """
+    sections: List[Tuple[str, str]] = []
+    current, lines = "summary", []
+    for line in text.split("\n"):
+        heading = _match_heading(line)
+        if heading:
+            if any(lines):
+                sections.append((current, "\n".join(lines).strip()))
+            current, lines = heading, []
+        else:
+            lines.append(line)
+    if any(lines):
+        sections.append((current, "\n".join(lines).strip()))
+    return sections
+
+
+def _keyword_pattern(keywords: List[str]) -> Optional[re.Pattern]:
+    keywords = [k.strip() for k in keywords if k and k.strip()]
+    if not keywords:
+        return None
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)({alternation})(?!\w)", re.IGNORECASE)
+
+
+def rank_sections(
+        sections: List[Tuple[str, str]],
+        required_skills: List[str],
+        required_certifications: List[str],
+) -> List[int]:
+    """
+    Returns section indexes ordered from most to least relevant to the job.
+    Relevance is the section's base weight plus the number of distinct required
+    skills/certifications it mentions.
+    """
+    pattern = _keyword_pattern(list(required_skills or []) + list(required_certifications or []))
+    scores = []
+    for index, (name, body) in enumerate(sections):
+        score = SECTION_WEIGHTS.get(name, 0.0)
+        if pattern:
+            score += 2.0 * len({m.lower() for m in pattern.findall(body)})
+        scores.append((score, index))
+    # Stable on ties: earlier sections first.
+    return [index for _, index in sorted(scores, key=lambda item: (-item[0], item[1]))]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text at a word boundary so it fits within max_tokens."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+    cut = text[:max_chars]
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    if boundary > max_chars // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + TRUNCATION_MARKER if cut.strip() else ""
+
+
+def condense_resume(
+        resume_text: str,
+        required_skills: List[str],
+        required_certifications: List[str],
+        token_budget: int,
+) -> str:
+    """
+    Cleans the resume and keeps the most job-relevant sections that fit the budget.
+    Selected sections are emitted in their original order so the text still reads naturally.
+    """
+    text = strip_boilerplate(normalize_whitespace(resume_text))
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    sections = extract_sections(text)
+    remaining = token_budget
+    chosen = {}
+    for index in rank_sections(sections, required_skills, required_certifications):
+        if remaining <= 0:
+            break
+        name, body = sections[index]
+        block = f"{name.upper()}:\n{body}"
+        if estimate_tokens(block) > remaining:
+            block = truncate_to_tokens(block, remaining)
+            if not block:
+                continue
+        chosen[index] = block
+        remaining -= estimate_tokens(block) + 1
+
+    return "\n\n".join(chosen[i] for i in sorted(chosen))
+
+
+def format_profile(profile: Optional[CandidateProfile]) -> str:
+    """One-line summary of an extracted candidate profile for the prompt."""
+    if not profile:
+        return "Not available"
+    years = "unknown" if profile.years_experience is None else f"{profile.years_experience:g}"
+    return (
+        f"Years of experience: {years}; "
+        f"Titles: {', '.join(profile.titles[:5]) or 'none found'}; "
+        f"Skills: {', '.join(profile.skills[:25]) or 'none found'}; "
+        f"Certifications: {', '.join(profile.certifications[:10]) or 'none found'}; "
+        f"Education: {'; '.join(profile.education[:3]) or 'none found'}"
+    )
+
+
+def build_screening_prompt(
+        job: Job,
+        app: Application,
+        resume_text: str,
+        token_budget: Optional[int] = None,
+        profile: Optional[CandidateProfile] = None,
+) -> str:
+    """
+    Builds the Gemini screening prompt with candidate text capped to the token budget.
+    When an extracted profile is given, its summary is sent first and the resume
+    excerpt only fills what is left of the budget.
+    """
+    budget = PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+    letter_budget = int(budget * COVER_LETTER_BUDGET_SHARE)
+
+    cover_letter = truncate_to_tokens(normalize_whitespace(app.cover_letter or ""), letter_budget)
+    profile_summary = truncate_to_tokens(format_profile(profile), budget // 4)
+    resume_budget = budget - estimate_tokens(cover_letter) - estimate_tokens(profile_summary)
+    resume = condense_resume(
+        resume_text or "", job.required_skills, job.required_certifications, resume_budget
+    )
+
+    return f"""
+    You are an expert AI recruiter. Analyze the candidate's application against the job description.
+
+    **Job Description:**
+    - Title: {job.title}
+    - Required Skills: {', '.join(job.required_skills)}
+    - Required Certifications: {', '.join(job.required_certifications)}
+
+    **Candidate's Application:**
+    - Cover Letter: {cover_letter}
+    - Claimed Skills: {', '.join(app.skills)}
+    - Claimed Certifications: {', '.join(app.certifications)}
+    - Resume Profile: {profile_summary}
+    - Parsed Resume Text: {resume}
+
+    **Your Task:**
+    Return your decision *only* in the following JSON format:
+    {{
+      "decision": "ACCEPTED" | "REJECTED" | "PENDING",
+      "reasoning": "A brief, one-sentence explanation for your decision."
+    }}
+    """
@@ -0,0 +1,278 @@
+# quotas.py
+"""
+Screening quotas and request rate limits.
+
+Every Gemini screening is charged against four budgets: screenings per hour and
+tokens per day, for both the job and the admin who owns it. Checks run against
+in-memory token buckets, so the hot path never touches the database. A
+background thread syncs each worker's consumption to the quotausage table every
+QUOTA_SYNC_SECONDS and clamps the local buckets to what all workers have used,
+so limits hold (approximately) across processes and restarts.
+
+An over-quota screening raises QuotaExceeded with the time until it fits again;
+callers defer it instead of failing it (see screening_queue.defer_screening).
+
+RateLimiter is the same bucket keyed by client IP or user id, used to answer
+bursts on /token and /applications/apply with 429 Too Many Requests.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from db import engine
+from models import QuotaUsage
+
+# 0 disables a limit.
+SCREENINGS_PER_HOUR_PER_OWNER = int(os.getenv("SCREENINGS_PER_HOUR_PER_OWNER", 500))
+SCREENINGS_PER_HOUR_PER_JOB = int(os.getenv("SCREENINGS_PER_HOUR_PER_JOB", 200))
+TOKENS_PER_DAY_PER_OWNER = int(os.getenv("TOKENS_PER_DAY_PER_OWNER", 2_000_000))
+TOKENS_PER_DAY_PER_JOB = int(os.getenv("TOKENS_PER_DAY_PER_JOB", 500_000))
+QUOTA_SYNC_SECONDS = float(os.getenv("QUOTA_SYNC_SECONDS", 15))
+
+# Allowance for Gemini's reply, charged on top of the estimated prompt tokens.
+SCREENING_OUTPUT_TOKENS = int(os.getenv("SCREENING_OUTPUT_TOKENS", 256))
+
+HOUR, DAY = 3600, 86400
+# metric -> (window in seconds, {scope: limit})
+LIMITS = {
+    "screenings": (HOUR, {"owner": SCREENINGS_PER_HOUR_PER_OWNER, "job": SCREENINGS_PER_HOUR_PER_JOB}),
+    "tokens": (DAY, {"owner": TOKENS_PER_DAY_PER_OWNER, "job": TOKENS_PER_DAY_PER_JOB}),
+}
+
+QuotaKey = Tuple[str, str, str]  # (scope, key, metric), e.g. ("job", job_id, "tokens")
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, scope: str, metric: str, retry_after: float):
+        super().__init__(f"{scope} {metric} quota exceeded; retry in {retry_after:.0f}s")
+        self.scope = scope
+        self.metric = metric
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Holds up to capacity units, refilled continuously at capacity / window units per second."""
+
+    def __init__(self, capacity: float, window_seconds: float):
+        self.capacity = capacity
+        self.rate = capacity / window_seconds
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until amount can be taken (0 if it can be taken now)."""
+        self._refill(time.monotonic() if now is None else now)
+        amount = min(amount, self.capacity)  # anything larger would never fit
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def clamp(self, remaining: float):
+        """Never report more than remaining (e.g. after other workers' usage is synced)."""
+        self.tokens = min(self.tokens, max(remaining, 0.0))
+
+    @property
+    def full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+def _window_start(metric: str, now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.utcnow()
+    if LIMITS[metric][0] == HOUR:
+        return now.replace(minute=0, second=0, microsecond=0)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class QuotaManager:
+    def __init__(self):
+        self._buckets: Dict[QuotaKey, TokenBucket] = {}
+        self._unsynced: Dict[QuotaKey, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _limited(quota_key: QuotaKey) -> bool:
+        scope, _, metric = quota_key
+        return bool(LIMITS[metric][1][scope])
+
+    def _bucket(self, quota_key: QuotaKey, used: int = 0) -> Optional[TokenBucket]:
+        """The key's bucket; a new one starts from `used`, this window's usage so far."""
+        scope, _, metric = quota_key
+        window, limits = LIMITS[metric]
+        if not limits[scope]:
+            return None
+        bucket = self._buckets.get(quota_key)
+        if bucket is None:
+            bucket = self._buckets[quota_key] = TokenBucket(limits[scope], window)
+            bucket.clamp(limits[scope] - used)
+        return bucket
+
+    def reserve(self, owner_id: str, job_id: str, tokens: int):
+        """Charges one screening of about `tokens` tokens, or raises QuotaExceeded."""
+        self._start_sync()
+        charges = [
+            (("owner", owner_id, "screenings"), 1),
+            (("job", job_id, "screenings"), 1),
+            (("owner", owner_id, "tokens"), tokens),
+            (("job", job_id, "tokens"), tokens),
+        ]
+        with self._lock:
+            missing = [quota_key for quota_key, _ in charges
+                       if self._limited(quota_key) and quota_key not in self._buckets]
+        # New keys start from the window's recorded usage, not a full bucket. Loaded
+        # outside the lock so a database round trip never stalls other screenings.
+        used = self._used(missing) if missing else {}
+        with self._lock:
+            now = time.monotonic()
+            buckets = [(quota_key, self._bucket(quota_key, used.get(quota_key, 0)), amount)
+                       for quota_key, amount in charges]
+            for (scope, _, metric), bucket, amount in buckets:
+                wait = bucket.wait_time(amount, now) if bucket else 0.0
+                if wait > 0:
+                    raise QuotaExceeded(scope, metric, wait)
+            for quota_key, bucket, amount in buckets:
+                if bucket:
+                    bucket.take(amount)
+                    self._unsynced[quota_key] += amount
+
+    # -----------------
+    # Database sync
+    # -----------------
+
+    def _used(self, quota_keys: Iterable[QuotaKey]) -> Dict[QuotaKey, int]:
+        used = {}
+        with Session(engine) as session:
+            for scope, key, metric in quota_keys:
+                usage = session.get(QuotaUsage, (scope, key, metric, _window_start(metric)))
+                used[(scope, key, metric)] = usage.used if usage else 0
+        return used
+
+    def sync(self):
+        """Adds this worker's usage to the shared totals and clamps local buckets to them."""
+        with self._lock:
+            unsynced, self._unsynced = self._unsynced, defaultdict(int)
+            tracked = list(self._buckets)
+        with Session(engine) as session:
+            for (scope, key, metric), amount in unsynced.items():
+                _add_usage(session, scope, key, metric, amount)
+            session.execute(delete(QuotaUsage).where(QuotaUsage.window_start < datetime.utcnow() - timedelta(days=2)))
+            session.commit()
+            used = {
+                (row.scope, row.key, row.metric): row.used
+                for row in session.exec(select(QuotaUsage).where(
+                    QuotaUsage.window_start.in_([_window_start("screenings"), _window_start("tokens")])
+                ))
+                if row.window_start == _window_start(row.metric)
+            }
+        with self._lock:
+            for quota_key in tracked:
+                bucket = self._buckets.get(quota_key)
+                if bucket is None:
+                    continue
+                if quota_key in used:
+                    # Usage recorded after the snapshot was taken is still unsynced; keep it counted.
+                    bucket.clamp(bucket.capacity - used[quota_key] - self._unsynced.get(quota_key, 0))
+                elif bucket.full:
+                    del self._buckets[quota_key]  # idle: drop it, it is rebuilt from the DB on next use
+
+    def _sync_loop(self):
+        while True:
+            time.sleep(QUOTA_SYNC_SECONDS)
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"[Quota Error]: Sync failed: {e}")
+
+    def _start_sync(self):
+        if self._sync_thread is None:
+            with self._lock:
+                if self._sync_thread is None:
+                    self._sync_thread = threading.Thread(target=self._sync_loop, name="quota-sync", daemon=True)
+                    self._sync_thread.start()
+                    atexit.register(self.flush)
+
+    def flush(self):
+        """Writes unsynced usage on shutdown so a restart does not forget it."""
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"[Quota Error]: Final sync failed: {e}")
+
+
+def _add_usage(session: Session, scope: str, key: str, metric: str, amount: int):
+    window_start = _window_start(metric)
+    match = (
+        (QuotaUsage.scope == scope) & (QuotaUsage.key == key)
+        & (QuotaUsage.metric == metric) & (QuotaUsage.window_start == window_start)
+    )
+    result = session.execute(update(QuotaUsage).where(match).values(used=QuotaUsage.used + amount))
+    if result.rowcount:
+        return
+    try:
+        # Savepoint: another worker may create the row for this window first.
+        with session.begin_nested():
+            session.add(QuotaUsage(scope=scope, key=key, metric=metric, window_start=window_start, used=amount))
+    except IntegrityError:
+        session.execute(update(QuotaUsage).where(match).values(used=QuotaUsage.used + amount))
+
+
+quotas = QuotaManager()
+
+
+def reserve_screening(owner_id: str, job_id: str, prompt_tokens: int):
+    """Charges a screening to its job and owner; raises QuotaExceeded when either is over quota."""
+    quotas.reserve(owner_id, job_id, prompt_tokens + SCREENING_OUTPUT_TOKENS)
+
+
+# -----------------
+# Request Rate Limits
+# -----------------
+
+class RateLimiter:
+    """Per-key token buckets: `per_minute` requests a minute, in bursts of up to `per_minute`."""
+
+    MAX_KEYS = 10_000
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> float:
+        """Counts one request. Returns 0 if allowed, else seconds until the next one is."""
+        if not self.per_minute:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._evict()
+                bucket = self._buckets[key] = TokenBucket(self.per_minute, 60)
+            else:
+                self._buckets.move_to_end(key)
+            wait = bucket.wait_time(1)
+            if not wait:
+                bucket.take(1)
+            return wait
+
+    def _evict(self):
+        """Drops idle (full) buckets, then the least recently used ones down to 90% of MAX_KEYS."""
+        for key in [key for key, bucket in self._buckets.items() if bucket.full]:
+            del self._buckets[key]
+        # Leave headroom so sustained traffic from new keys does not rescan on every request.
+        while len(self._buckets) > self.MAX_KEYS * 9 // 10:
+            self._buckets.popitem(last=False)
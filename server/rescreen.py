@@ -0,0 +1,175 @@
+# rescreen.py
+"""
+Re-screening of a job's existing applications.
+
+When a job's requirements change, the AI decisions made against the old
+requirements go stale. A RescreenRun re-evaluates the job's applications (all of
+them, or those matching a status / id filter) through the normal screening
+pipeline on a bounded ScreeningPool. Parsed resume text and profiles are reused,
+so no resume is parsed again. Applications a recruiter decided by hand
+(Application.decided_by) are left alone unless the run includes them
+explicitly. Every decision is written to DecisionHistory,
+which is how flipped candidates are reported. A run that hits its job's or
+owner's screening quota slows down to the quota rather than failing.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from ai_processing import ScreeningPool, run_ai_screening
+from db import engine
+from models import Application, DecisionChange, DecisionHistory, RescreenRun, User
+from quotas import QuotaExceeded
+
+RESCREEN_CONCURRENCY = int(os.getenv("RESCREEN_CONCURRENCY", 4))
+RESCREEN_MAX_CONCURRENCY = int(os.getenv("RESCREEN_MAX_CONCURRENCY", 16))
+# A RUNNING re-screen with no progress for this long is treated as dead (e.g. server restart).
+RESCREEN_STALE_MINUTES = int(os.getenv("RESCREEN_STALE_MINUTES", 10))
+# Longest single sleep while a re-screen waits for its quota to refill.
+RESCREEN_QUOTA_POLL_SECONDS = 30
+
+# Statuses the AI sets: the default filter. Recruiter decisions are excluded by
+# Application.decided_by, as the admin UI sets ACCEPTED / REJECTED by hand too.
+AI_STATUSES = ["PENDING", "ACCEPTED", "REJECTED"]
+
+
+def _application_filter(
+        job_id: str,
+        statuses: Optional[List[str]],
+        application_ids: Optional[List[str]],
+        include_recruiter_decisions: bool = False,
+):
+    statement = select(Application.id).where(Application.job_id == job_id)
+    if not include_recruiter_decisions:
+        statement = statement.where(Application.decided_by.is_(None))
+    if statuses:
+        statement = statement.where(Application.status.in_(statuses))
+    if application_ids:
+        statement = statement.where(Application.id.in_(application_ids))
+    return statement
+
+
+def active_run(session: Session, job_id: str) -> Optional[RescreenRun]:
+    """The job's re-screen that is still queued or making progress, if any."""
+    cutoff = datetime.utcnow() - timedelta(minutes=RESCREEN_STALE_MINUTES)
+    for run in session.exec(
+        select(RescreenRun).where(RescreenRun.job_id == job_id, RescreenRun.status.in_(["QUEUED", "RUNNING"]))
+    ).all():
+        if (run.updated_at or run.created_at) > cutoff:
+            return run
+    return None
+
+
+def create_rescreen(
+        session: Session,
+        job_id: str,
+        requested_by: str,
+        statuses: Optional[List[str]] = None,
+        application_ids: Optional[List[str]] = None,
+        include_recruiter_decisions: bool = False,
+        concurrency: Optional[int] = None,
+) -> RescreenRun:
+    statuses = [s.upper() for s in statuses] if statuses else (None if application_ids else AI_STATUSES)
+    run = RescreenRun(
+        job_id=job_id,
+        requested_by=requested_by,
+        statuses=statuses,
+        application_ids=application_ids,
+        include_recruiter_decisions=include_recruiter_decisions,
+        concurrency=concurrency or RESCREEN_CONCURRENCY,
+        total=len(session.exec(
+            _application_filter(job_id, statuses, application_ids, include_recruiter_decisions)
+        ).all()),
+    )
+    session.add(run)
+    session.commit()
+    session.refresh(run)
+    return run
+
+
+def _set_status(run_id: str, status: str, error: Optional[str] = None, **fields):
+    now = datetime.utcnow()
+    if status in ("COMPLETED", "FAILED"):
+        fields["finished_at"] = now
+    with Session(engine) as session:
+        session.execute(
+            update(RescreenRun).where(RescreenRun.id == run_id)
+            .values(status=status, last_error=error, updated_at=now, **fields)
+        )
+        session.commit()
+
+
+def _screen_one(run_id: str, app_id: str, job_id: str, override_recruiter: bool):
+    while True:
+        try:
+            result = run_ai_screening(app_id, job_id, run_id=run_id, override_recruiter=override_recruiter)
+            break
+        except QuotaExceeded as e:
+            # A re-screen's decisions belong to its run, so over-quota screenings wait here
+            # instead of in the screening queue; the heartbeat keeps the run from looking stale.
+            print(f"[Rescreen]: Run {run_id} waiting for quota: {e}")
+            with Session(engine) as session:
+                session.execute(update(RescreenRun).where(RescreenRun.id == run_id).values(updated_at=datetime.utcnow()))
+                session.commit()
+            time.sleep(min(e.retry_after, RESCREEN_QUOTA_POLL_SECONDS))
+    flipped = result is not None and result[0] != result[1]
+    # Atomic increments: the pool's threads all update the same row.
+    with Session(engine) as session:
+        session.execute(
+            update(RescreenRun).where(RescreenRun.id == run_id).values(
+                processed=RescreenRun.processed + 1,
+                flipped=RescreenRun.flipped + int(flipped),
+                failed=RescreenRun.failed + int(result is None),
+                updated_at=datetime.utcnow(),
+            )
+        )
+        session.commit()
+
+
+def run_rescreen(run_id: str):
+    """Screens every matching application again; progress is written to the run as it goes."""
+    with Session(engine) as session:
+        run = session.get(RescreenRun, run_id)
+        if not run:
+            print(f"[Rescreen Error]: Run {run_id} not found.")
+            return
+        job_id, concurrency, override = run.job_id, run.concurrency, run.include_recruiter_decisions
+        # Snapshot the ids first: re-screening changes the statuses being filtered on.
+        app_ids = session.exec(_application_filter(job_id, run.statuses, run.application_ids, override)).all()
+
+    print(f"[Rescreen]: Re-screening {len(app_ids)} applications for job {job_id} ({concurrency} at a time)")
+    _set_status(run_id, "RUNNING", total=len(app_ids), processed=0, flipped=0, failed=0)
+    try:
+        with ScreeningPool(concurrency) as pool:
+            for app_id in app_ids:
+                pool.submit(_screen_one, run_id, app_id, job_id, override)
+        _set_status(run_id, "COMPLETED")
+        print(f"[Rescreen]: Finished run {run_id}")
+    except Exception as e:
+        print(f"[Rescreen Error]: Run {run_id} failed: {e}")
+        _set_status(run_id, "FAILED", error=str(e))
+
+
+def decision_changes(session: Session, run_id: str) -> List[DecisionChange]:
+    """Applications whose decision this run changed."""
+    rows = session.exec(
+        select(DecisionHistory, User.name)
+        .join(Application, Application.id == DecisionHistory.application_id)
+        .join(User, User.id == Application.candidate_id)
+        .where(DecisionHistory.run_id == run_id, DecisionHistory.previous_status != DecisionHistory.status)
+        .order_by(DecisionHistory.created_at)
+    ).all()
+    return [
+        DecisionChange(
+            application_id=history.application_id,
+            candidate_name=name,
+            previous_status=history.previous_status,
+            status=history.status,
+            reasoning=history.reasoning,
+        )
+        for history, name in rows
+    ]
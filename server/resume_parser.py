@@ -0,0 +1,96 @@
+import mmap
+import os
+from typing import Iterator
+
+# --- Extraction Budget ---
+# Screening only needs the first few pages of a resume; long portfolios are cut off
+# once either limit is reached instead of being extracted in full.
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", 10))
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", 30000))
+
+PDF_MAGIC = b"%PDF-"
+
+
+class ResumeParseError(Exception):
+    """Raised when a resume cannot be read (encrypted, malformed or empty)."""
+
+
+def iter_pdf_pages(file_path: str, max_pages: int = RESUME_MAX_PAGES) -> Iterator[str]:
+    """
+    Yields the text of each PDF page, stopping after max_pages.
+    The file is memory-mapped so PyPDF2 seeks over the OS page cache instead of
+    copying the whole file into Python memory.
+    """
+    import PyPDF2  # imported on first parse, not when the API boots
+
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ResumeParseError("file is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Fail fast on files that are not PDFs at all, before PyPDF2 scans them.
+            if mapped.find(PDF_MAGIC, 0, 1024) == -1:
+                raise ResumeParseError("missing %PDF header")
+            try:
+                reader = PyPDF2.PdfReader(mapped, strict=False)
+                if reader.is_encrypted and not reader.decrypt(""):
+                    raise ResumeParseError("PDF is password protected")
+                for index, page in enumerate(reader.pages):
+                    if index >= max_pages:
+                        break
+                    yield page.extract_text() or ""
+            except ResumeParseError:
+                raise
+            except Exception as e:
+                raise ResumeParseError(f"malformed PDF: {e}") from e
+
+
+def extract_pdf_text(
+        file_path: str,
+        max_pages: int = RESUME_MAX_PAGES,
+        max_chars: int = RESUME_MAX_CHARS,
+) -> str:
+    """Streams pages into a list-backed buffer and stops once the character budget is met."""
+    parts, size = [], 0
+    for text in iter_pdf_pages(file_path, max_pages):
+        parts.append(text)
+        size += len(text)
+        if size >= max_chars:
+            break
+    return "".join(parts)[:max_chars]
+
+
+def extract_docx_text(file_path: str, max_chars: int = RESUME_MAX_CHARS) -> str:
+    import docx
+
+    parts, size = [], 0
+    for para in docx.Document(file_path).paragraphs:
+        parts.append(para.text)
+        size += len(para.text) + 1
+        if size >= max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+
+def extract_txt_text(file_path: str, max_chars: int = RESUME_MAX_CHARS) -> str:
+    with open(file_path, "r", errors="replace") as f:
+        return f.read(max_chars)
+
+
+def parse_resume(file_path: str) -> str:
+    """Parses a resume file (PDF or DOCX) and returns the text."""
+    text = ""
+    try:
+        if file_path.endswith('.pdf'):
+            text = extract_pdf_text(file_path)
+
+        elif file_path.endswith('.docx'):
+            text = extract_docx_text(file_path)
+
+        elif file_path.endswith('.txt'):
+            text = extract_txt_text(file_path)
+
+        print(f"[Parser]: Successfully parsed {file_path}")
+        return text
+    except Exception as e:
+        print(f"[Parser Error]: Could not parse {file_path}. Error: {e}")
+        return f"Error: Could not parse resume file. {e}"
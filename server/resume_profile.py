@@ -0,0 +1,135 @@
+import hashlib
+import re
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from models import CandidateProfile
+from prompt_builder import extract_sections, normalize_whitespace, strip_boilerplate
+
+MAX_LIST_ITEMS = 50
+
+_LIST_SPLIT = re.compile(r"[,;|•·\n]+")
+_YEARS_CLAIM = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)", re.IGNORECASE)
+_DATE_RANGE = re.compile(
+    r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)",
+    re.IGNORECASE,
+)
+_TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|programmer|manager|analyst|designer|scientist|consultant|"
+    r"architect|administrator|specialist|director|lead|intern|officer|coordinator|"
+    r"technician|recruiter|accountant|nurse|teacher)\b",
+    re.IGNORECASE,
+)
+_DEGREE_WORDS = re.compile(
+    r"\b(bachelor|master|b\.?sc|m\.?sc|b\.?a|m\.?a|b\.?eng|m\.?eng|mba|ph\.?d|doctorate|"
+    r"diploma|degree|associate|hnd|gcse|a-levels?)\b",
+    re.IGNORECASE,
+)
+
+
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Returns the SHA-256 hex digest of a file, reading it in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    seen, result = set(), []
+    for item in items:
+        item = item.strip(" -–:.\t")
+        key = item.lower()
+        if item and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result[:MAX_LIST_ITEMS]
+
+
+def _estimate_years(text: str, experience: str) -> Optional[float]:
+    """Uses the span of dated roles if there are any, else an explicit "N years" claim."""
+    current_year = datetime.utcnow().year
+    intervals = []
+    for start, end in _DATE_RANGE.findall(experience):
+        end_year = int(end) if end.isdigit() else current_year
+        if int(start) <= end_year:
+            intervals.append((int(start), end_year))
+
+    if intervals:
+        # Merge overlapping roles so concurrent jobs are not double counted.
+        intervals.sort()
+        total, (cur_start, cur_end) = 0, intervals[0]
+        for start, end in intervals[1:]:
+            if start <= cur_end:
+                cur_end = max(cur_end, end)
+            else:
+                total += cur_end - cur_start
+                cur_start, cur_end = start, end
+        return float(total + cur_end - cur_start)
+
+    claims = [int(n) for n in _YEARS_CLAIM.findall(text)]
+    return float(max(claims)) if claims else None
+
+
+def extract_profile(resume_text: str) -> dict:
+    """Turns raw resume text into the fields of a CandidateProfile."""
+    text = strip_boilerplate(normalize_whitespace(resume_text))
+    sections = {}
+    for name, body in extract_sections(text):
+        sections[name] = f"{sections[name]}\n{body}" if name in sections else body
+
+    experience = sections.get("experience", "")
+    education = sections.get("education", "")
+    return {
+        "skills": _dedupe(_LIST_SPLIT.split(sections.get("skills", ""))),
+        "certifications": _dedupe(sections.get("certifications", "").split("\n")),
+        "titles": _dedupe(
+            line for line in experience.split("\n")
+            if len(line) <= 80 and _TITLE_WORDS.search(line)
+        ),
+        "education": _dedupe(
+            line for line in education.split("\n")
+            if len(line) <= 120 and _DEGREE_WORDS.search(line)
+        ),
+        "years_experience": _estimate_years(text, experience),
+        "resume_text": text,
+    }
+
+
+def _profile_query(user_id: str, resume_hash: str):
+    return select(CandidateProfile).where(
+        CandidateProfile.user_id == user_id,
+        CandidateProfile.resume_hash == resume_hash,
+    )
+
+
+def find_profile(session: Session, user_id: str, resume_hash: str) -> Optional[CandidateProfile]:
+    """Returns the profile already extracted for this candidate's resume, if any."""
+    return session.exec(_profile_query(user_id, resume_hash)).first()
+
+
+def create_profile(
+        session: Session,
+        user_id: str,
+        resume_hash: str,
+        resume_text: str,
+) -> Optional[CandidateProfile]:
+    """
+    Extracts and stores the profile for freshly parsed resume text.
+    Returns None for a failed parse so that errors are never cached.
+    """
+    if not resume_text or resume_text.startswith("Error:"):
+        return None
+
+    profile = CandidateProfile(user_id=user_id, resume_hash=resume_hash, **extract_profile(resume_text))
+    try:
+        # Savepoint: a concurrent screening of the same resume may win the insert.
+        with session.begin_nested():
+            session.add(profile)
+    except IntegrityError:
+        profile = find_profile(session, user_id, resume_hash)
+    return profile
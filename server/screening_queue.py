@@ -0,0 +1,225 @@
+# screening_queue.py
+"""
+Durable, per-worker queue for AI screenings.
+
+submit_application writes a PendingScreening row in the same transaction as the
+application. Every worker process runs a ScreeningQueue that claims rows
+atomically, screens them on a bounded ScreeningPool and deletes each row once
+its screening has finished, so nothing is lost if the process dies.
+
+On SIGTERM the queue stops taking new work at once. At shutdown it waits up to
+SCREENING_DRAIN_SECONDS for screenings in flight and releases the claimed rows
+it has not started, which the next worker to sweep (or start) picks up. Rows of
+screenings still running stay claimed, so no other worker calls Gemini for them
+again; if the process dies first they are reclaimed after
+SCREENING_CLAIM_STALE_MINUTES.
+
+Screenings over a job's or owner's quota (see quotas.py) are deferred: their row
+is released with a not_before time and picked up by a later sweep.
+"""
+import os
+import signal
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import and_, delete, or_, update
+from sqlmodel import Session, select
+
+from ai_processing import ScreeningPool, run_ai_screening
+from db import engine
+from models import PendingScreening
+from quotas import QuotaExceeded
+
+SCREENING_CONCURRENCY = int(os.getenv("SCREENING_CONCURRENCY", 4))
+SCREENING_DRAIN_SECONDS = float(os.getenv("SCREENING_DRAIN_SECONDS", 10))
+SCREENING_SWEEP_SECONDS = float(os.getenv("SCREENING_SWEEP_SECONDS", 30))
+SCREENING_CLAIM_STALE_MINUTES = int(os.getenv("SCREENING_CLAIM_STALE_MINUTES", 15))
+
+
+def enqueue_screening(session: Session, application_id: str, job_id: str):
+    """Records a screening request; it is committed with the caller's transaction."""
+    session.add(PendingScreening(application_id=application_id, job_id=job_id))
+
+
+def defer_screening(application_id: str, job_id: str, retry_after: float):
+    """Queues (or re-queues) a screening that hit a quota; sweeps skip it until not_before."""
+    not_before = datetime.utcnow() + timedelta(seconds=retry_after)
+    with Session(engine) as session:
+        result = session.execute(
+            update(PendingScreening).where(PendingScreening.application_id == application_id)
+            .values(claimed_by=None, claimed_at=None, not_before=not_before)
+        )
+        if not result.rowcount:
+            session.add(PendingScreening(application_id=application_id, job_id=job_id, not_before=not_before))
+        session.commit()
+    print(f"[Screening Queue]: Deferred application {application_id} until {not_before:%H:%M:%S} (quota)")
+
+
+def _claimable():
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=SCREENING_CLAIM_STALE_MINUTES)
+    return and_(
+        or_(PendingScreening.claimed_at.is_(None), PendingScreening.claimed_at < cutoff),
+        or_(PendingScreening.not_before.is_(None), PendingScreening.not_before <= now),
+    )
+
+
+class ScreeningQueue:
+    def __init__(self, concurrency: int = SCREENING_CONCURRENCY):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._pool: Optional[ScreeningPool] = None
+        self._accepting = False
+        self._inflight: Set[str] = set()
+        self._idle = threading.Condition()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    @property
+    def accepting(self) -> bool:
+        return self._accepting
+
+    def start(self):
+        """Starts screening; the first sweep claims anything left over by earlier workers."""
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._pool = ScreeningPool(self.concurrency)
+        self._accepting = True
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="screening-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_accepting(self):
+        """Safe to call from a signal handler: screenings not yet started are handed off."""
+        self._accepting = False
+        self._stop.set()
+
+    def _claim(self, application_id: str) -> bool:
+        with Session(engine) as session:
+            # Conditional UPDATE: exactly one worker wins each row.
+            result = session.execute(
+                update(PendingScreening)
+                .where(PendingScreening.application_id == application_id, _claimable())
+                .values(claimed_by=self.worker_id, claimed_at=datetime.utcnow())
+            )
+            session.commit()
+            return result.rowcount == 1
+
+    def _release(self, application_id: Optional[str] = None, keep: Iterable[str] = ()) -> int:
+        """Un-claims this worker's rows (or one of them), except keep, so another worker can take them."""
+        statement = update(PendingScreening).where(PendingScreening.claimed_by == self.worker_id)
+        if application_id:
+            statement = statement.where(PendingScreening.application_id == application_id)
+        keep = list(keep)
+        if keep:
+            statement = statement.where(PendingScreening.application_id.not_in(keep))
+        with Session(engine) as session:
+            result = session.execute(statement.values(claimed_by=None, claimed_at=None))
+            session.commit()
+            return result.rowcount
+
+    def submit(self, application_id: str, job_id: str) -> bool:
+        """Claims and schedules one screening. Returns False if it was left for another worker."""
+        if not self._accepting or not self._claim(application_id):
+            return False
+        with self._idle:
+            self._inflight.add(application_id)
+        try:
+            self._pool.submit(self._run, application_id, job_id)
+        except RuntimeError:  # pool already shut down
+            self._done(application_id)
+            self._release(application_id)
+            return False
+        return True
+
+    def _run(self, application_id: str, job_id: str):
+        try:
+            if not self._accepting:
+                # Shutting down before this one started: hand it off untouched.
+                self._release(application_id)
+                return
+            try:
+                run_ai_screening(application_id, job_id)
+            except QuotaExceeded as e:
+                defer_screening(application_id, job_id, e.retry_after)
+                return
+            with Session(engine) as session:
+                # Only while still ours: a row reclaimed as stale belongs to another worker now.
+                session.execute(delete(PendingScreening).where(
+                    PendingScreening.application_id == application_id,
+                    PendingScreening.claimed_by == self.worker_id,
+                ))
+                session.commit()
+        finally:
+            self._done(application_id)
+
+    def _done(self, application_id: str):
+        with self._idle:
+            self._inflight.discard(application_id)
+            self._idle.notify_all()
+
+    def sweep(self) -> int:
+        """Claims unclaimed or abandoned screenings, e.g. ones handed off by a worker that shut down."""
+        with Session(engine) as session:
+            rows = session.exec(
+                select(PendingScreening.application_id, PendingScreening.job_id)
+                .where(_claimable())
+                .order_by(PendingScreening.created_at)
+                .limit(self.concurrency * 2)
+            ).all()
+        # submit() blocks while the pool is full, so a backlog is claimed only as fast as it is screened.
+        return sum(self.submit(application_id, job_id) for application_id, job_id in rows)
+
+    def _sweep_loop(self):
+        while not self._stop.is_set():
+            try:
+                claimed = self.sweep()
+            except Exception as e:
+                print(f"[Screening Queue Error]: Sweep failed: {e}")
+                claimed = 0
+            if not claimed:
+                self._stop.wait(SCREENING_SWEEP_SECONDS)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Waits up to timeout seconds (None: forever) until no screenings are in flight."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._inflight, timeout)
+
+    def shutdown(self, timeout: float = SCREENING_DRAIN_SECONDS) -> int:
+        """
+        Stops taking work, waits up to timeout seconds for screenings in flight and
+        releases the claimed rows that are not running. Returns the number of
+        screenings handed off.
+        """
+        self.stop_accepting()
+        self.wait_idle(timeout)
+        with self._idle:
+            # Pool threads cannot be stopped, so rows in flight stay claimed: a running
+            # screening deletes its row when it finishes, a queued one releases it in _run.
+            running = set(self._inflight)
+        handed_off = self._release(keep=running)
+        if self._pool:
+            self._pool.close(wait=False)
+        print(f"[Screening Queue]: Worker {self.worker_id} stopped; handed off {handed_off} screenings")
+        return handed_off
+
+
+def install_sigterm_handler(queue: ScreeningQueue):
+    """
+    Chains onto the current SIGTERM handler (uvicorn's) so the queue stops taking
+    screenings as soon as the signal arrives, while requests are still draining.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return  # signal handlers can only be installed from the main thread
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        queue.stop_accepting()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
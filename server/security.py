@@ -10,6 +10,8 @@ BCRYPT_MAX_BYTES = 72
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+RESUME_LINK_EXPIRE_SECONDS = int(os.getenv("RESUME_LINK_EXPIRE_SECONDS", 300))
+RESUME_TOKEN_SCOPE = "resume"
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 def get_password_hash(password: str) -> str:
@@ -50,4 +52,11 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
         expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+#Generates the token in resume download links. URLs end up in logs, history and
+#Referer headers, so it only opens one resume, for a few minutes.
+def create_resume_token(user_id: str, resume_hash: str) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(seconds=RESUME_LINK_EXPIRE_SECONDS)
+    to_encode = {"sub": user_id, "scope": RESUME_TOKEN_SCOPE, "resume_hash": resume_hash, "exp": expire}
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
@@ -0,0 +1,67 @@
+# serve.py
+"""
+Production entry point: migrates the database (alembic upgrade head), then
+runs main:app on several uvicorn worker processes.
+
+    python serve.py
+    python serve.py --workers 4 --port 8000 --graceful-timeout 15
+
+On SIGTERM each worker stops taking new screenings, finishes the requests in
+flight (up to --graceful-timeout seconds), then drains screenings for up to
+SCREENING_DRAIN_SECONDS and hands the rest back to the queue for the next
+worker. Keep the two together below the platform's kill timeout (30s on
+Kubernetes by default).
+"""
+import argparse
+import os
+
+import uvicorn
+from alembic import command
+from alembic.config import Config
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY if set, otherwise one worker per CPU available to this process."""
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.getenv("WEB_CONCURRENCY"))
+    try:
+        return len(os.sched_getaffinity(0))  # respects CPU pinning / container cpusets
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def migrate():
+    """Brings the schema up to date once, before any worker starts."""
+    command.upgrade(Config(os.path.join(SERVER_DIR, "alembic.ini")), "head")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", 15)),
+                        help="Seconds to wait for open requests on shutdown")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    parser.add_argument("--no-migrate", action="store_true", help="Skip `alembic upgrade head` on start")
+    args = parser.parse_args()
+
+    if not args.no_migrate:
+        migrate()
+
+    uvicorn.run(
+        "main:app",
+        app_dir=SERVER_DIR,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
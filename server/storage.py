@@ -0,0 +1,275 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from models import ResumeBlob
+
+load_dotenv()
+
+# "local" (sharded directory) or "s3" (any S3-compatible service, e.g. MinIO)
+RESUME_STORAGE_BACKEND = os.getenv("RESUME_STORAGE_BACKEND", "local").lower()
+RESUME_UPLOAD_DIR = os.getenv(
+    "RESUME_UPLOAD_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads", "resumes"),
+)
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # set for MinIO / other S3-compatible stores
+S3_PREFIX = os.getenv("S3_PREFIX", "resumes/")
+S3_URL_EXPIRE_SECONDS = int(os.getenv("S3_URL_EXPIRE_SECONDS", 300))
+
+
+def resume_key(resume_hash: str, extension: str) -> str:
+    """Content-addressed key, sharded two levels deep: ab/cd/abcd...<ext>."""
+    return f"{resume_hash[:2]}/{resume_hash[2:4]}/{resume_hash}{extension.lower()}"
+
+
+def _is_legacy_path(key: str) -> bool:
+    # Resumes uploaded before content addressing stored a filesystem path
+    # (e.g. ./uploads/resumes/<uuid>.pdf) instead of a storage key.
+    return os.path.isabs(key) or key.startswith(".")
+
+
+class ResumeStorage:
+    """Interface every resume storage backend implements. Keys come from resume_key()."""
+
+    def put(self, data: bytes, extension: str, resume_hash: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Stores the file once per content hash. Returns (key, sha256).
+        Applications go through store_resume(), which references the file first.
+        """
+        resume_hash = resume_hash or hashlib.sha256(data).hexdigest()
+        key = resume_key(resume_hash, extension)
+        if not self.exists(key):
+            self._write(key, data)
+        return key, resume_hash
+
+    def _write(self, key: str, data: bytes):
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        """Yields a filesystem path for the file (parsers need a real file)."""
+        raise NotImplementedError
+        yield
+
+    def filesystem_path(self, key: str) -> Optional[str]:
+        """Path the web server can stream directly, if the backend is on local disk."""
+        return None
+
+    def download_url(self, key: str) -> Optional[str]:
+        """Short-lived URL clients can fetch directly, if the backend supports it."""
+        return None
+
+
+class LocalResumeStorage(ResumeStorage):
+    """Content-addressed files on a local (or network-mounted) directory."""
+
+    def __init__(self, root: str = RESUME_UPLOAD_DIR):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return key if _is_legacy_path(key) else os.path.join(self.root, key)
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a concurrent reader never sees a half-written resume.
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        yield self._path(key)
+
+    def filesystem_path(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        return path if os.path.isfile(path) else None
+
+
+class S3ResumeStorage(ResumeStorage):
+    """Content-addressed objects in an S3-compatible bucket (AWS S3, MinIO, ...)."""
+
+    def __init__(self, bucket: str = S3_BUCKET, endpoint_url: Optional[str] = S3_ENDPOINT_URL,
+                 prefix: str = S3_PREFIX, client=None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError("RESUME_STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        if not bucket:
+            raise ValueError("S3_BUCKET must be set when RESUME_STORAGE_BACKEND=s3")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _write(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=data)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception:
+            return False
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"]
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(key)[1])
+        try:
+            with os.fdopen(fd, "wb") as f, self.open(key) as body:
+                shutil.copyfileobj(body, f)
+            yield path
+        finally:
+            os.remove(path)
+
+    def download_url(self, key: str) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=S3_URL_EXPIRE_SECONDS,
+        )
+
+
+_storage: Optional[ResumeStorage] = None
+
+
+def get_storage() -> ResumeStorage:
+    """Returns the configured backend (created on first use)."""
+    global _storage
+    if _storage is None:
+        if RESUME_STORAGE_BACKEND == "s3":
+            _storage = S3ResumeStorage()
+        elif RESUME_STORAGE_BACKEND == "local":
+            _storage = LocalResumeStorage()
+        else:
+            raise ValueError(f"Unknown RESUME_STORAGE_BACKEND: {RESUME_STORAGE_BACKEND}")
+    return _storage
+
+
+# -----------------
+# Reference Counting
+# -----------------
+#
+# Uploads and deletes of the same file are serialized on its ResumeBlob row: an
+# upload takes its reference (locking the row) before checking whether the file
+# exists, and reclaim_resume deletes the row and the file in one transaction,
+# only if the count is still 0. Whichever comes second sees the other's result.
+# A row with ref_count 0 is a file whose reclaim has not finished yet.
+
+def acquire_resume(session: Session, key: str, resume_hash: str, size: int):
+    """Records one more application referencing the stored file."""
+    result = session.execute(
+        update(ResumeBlob).where(ResumeBlob.key == key).values(ref_count=ResumeBlob.ref_count + 1)
+    )
+    if result.rowcount:
+        return
+    try:
+        # Savepoint: another request may create the row for the same file first.
+        with session.begin_nested():
+            session.add(ResumeBlob(key=key, resume_hash=resume_hash, size=size, ref_count=1))
+    except IntegrityError:
+        session.execute(
+            update(ResumeBlob).where(ResumeBlob.key == key).values(ref_count=ResumeBlob.ref_count + 1)
+        )
+
+
+def store_resume(session: Session, data: bytes, extension: str, resume_hash: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Takes a reference to the file, then stores it if it is not stored yet.
+    Returns (key, sha256); the reference is committed with the caller's transaction.
+    """
+    resume_hash = resume_hash or hashlib.sha256(data).hexdigest()
+    key = resume_key(resume_hash, extension)
+    # Savepoint: if the write fails the reference is dropped with it.
+    with session.begin_nested():
+        acquire_resume(session, key, resume_hash, len(data))
+        get_storage().put(data, extension, resume_hash)
+    return key, resume_hash
+
+
+def release_resume(session: Session, key: str) -> bool:
+    """
+    Drops one reference. Returns True when nothing references the file any more;
+    the caller runs reclaim_resume() after committing.
+    """
+    session.execute(
+        update(ResumeBlob).where(ResumeBlob.key == key).values(ref_count=ResumeBlob.ref_count - 1)
+    )
+    blob = session.get(ResumeBlob, key, populate_existing=True)
+    # No row means a legacy upload that was never counted: leave the file alone.
+    return blob is not None and blob.ref_count <= 0
+
+
+def reclaim_resume(session: Session, key: str):
+    """Deletes an unreferenced file, unless a new upload re-acquired it meanwhile."""
+    result = session.execute(delete(ResumeBlob).where(ResumeBlob.key == key, ResumeBlob.ref_count <= 0))
+    if not result.rowcount:
+        session.rollback()
+        return
+    try:
+        # Delete the file before committing: an upload waiting on the row then finds
+        # neither row nor file, and writes the file again.
+        get_storage().delete(key)
+    except Exception:
+        session.rollback()
+        raise
+    session.commit()
+    print(f"[Storage]: Reclaimed {key}")
+
+
+def discard_resume(session: Session, key: str, resume_hash: str):
+    """
+    Deletes a file written by a store_resume() whose transaction was rolled back,
+    unless an application references it. Creating the row first serializes this
+    with concurrent uploads of the same file; it then goes through reclaim_resume.
+    """
+    session.add(ResumeBlob(key=key, resume_hash=resume_hash, size=0, ref_count=0))
+    try:
+        session.flush()
+    except IntegrityError:
+        # The row exists: the file is referenced (or being reclaimed) elsewhere.
+        session.rollback()
+        return
+    reclaim_resume(session, key)